@@ -0,0 +1,33 @@
+"""Drop redundant single-column indexes on crypto_prices
+
+Revision ID: 10dea3ee3245
+Revises: 2355926f1f1a
+Create Date: 2026-10-15 10:03:41.207615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '10dea3ee3245'
+down_revision: Union[str, None] = '2355926f1f1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop the currency_id index already covered by composite indexes."""
+    # currency_id is the leading column of idx_currency_timestamp and
+    # uq_currency_timestamp. ix_crypto_prices_timestamp stays: it existed
+    # when create_hypertable ran, so TimescaleDB did not create its default
+    # time index, and time-only scans (aggregate refreshes, compression
+    # jobs) need a time-leading index on every chunk.
+    op.drop_index('ix_crypto_prices_currency_id', table_name='crypto_prices')
+
+
+def downgrade() -> None:
+    """Recreate the currency_id index on crypto_prices."""
+    op.create_index('ix_crypto_prices_currency_id', 'crypto_prices', ['currency_id'], unique=False)
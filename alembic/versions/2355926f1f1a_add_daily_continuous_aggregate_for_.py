@@ -0,0 +1,67 @@
+"""Add daily continuous aggregate for crypto_prices
+
+Revision ID: 2355926f1f1a
+Revises: a1ab1bdb31b1
+Create Date: 2026-10-15 09:12:04.518223
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2355926f1f1a'
+down_revision: Union[str, None] = 'a1ab1bdb31b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the crypto_prices_daily continuous aggregate and its refresh policy."""
+    # Daily OHLCV rollup. close_sum and row_count are kept (instead of an
+    # average) so averages over any range of buckets stay exact.
+    # materialized_only = false lets queries see rows newer than the last refresh.
+    # WITH NO DATA is required to create a continuous aggregate inside a transaction.
+    op.execute("""
+        CREATE MATERIALIZED VIEW crypto_prices_daily
+        WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+        SELECT
+            currency_id,
+            time_bucket(INTERVAL '1 day', timestamp) AS bucket,
+            first(open, timestamp) AS open,
+            max(high) AS high,
+            min(low) AS low,
+            last(close, timestamp) AS close,
+            sum(volume) AS volume,
+            sum(close) AS close_sum,
+            count(*) AS row_count
+        FROM crypto_prices
+        GROUP BY currency_id, bucket
+        WITH NO DATA;
+    """)
+
+    # Refresh the last 30 days every hour (older chunks are compressed and
+    # rarely receive late data)
+    op.execute("""
+        SELECT add_continuous_aggregate_policy(
+            'crypto_prices_daily',
+            start_offset => INTERVAL '30 days',
+            end_offset => INTERVAL '1 hour',
+            schedule_interval => INTERVAL '1 hour'
+        );
+    """)
+
+    # The policy never looks further back than 30 days, so materialize the
+    # existing history once. Refreshes cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.execute("CALL refresh_continuous_aggregate('crypto_prices_daily', NULL, NULL);")
+
+
+def downgrade() -> None:
+    """Drop the crypto_prices_daily continuous aggregate."""
+    op.execute("""
+        SELECT remove_continuous_aggregate_policy('crypto_prices_daily', if_exists => TRUE);
+    """)
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS crypto_prices_daily;")
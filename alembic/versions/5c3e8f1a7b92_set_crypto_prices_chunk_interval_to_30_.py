@@ -0,0 +1,35 @@
+"""Set crypto_prices chunk interval to 30 days
+
+Revision ID: 5c3e8f1a7b92
+Revises: e288da3085a9
+Create Date: 2026-10-15 14:05:12.630418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e8f1a7b92'
+down_revision: Union[str, None] = 'e288da3085a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Use 30-day chunks for crypto_prices, matching the compression delay."""
+    # Hypertables created while revision a1ab1bdb31b1 still used 7-day
+    # chunks keep that interval until it is changed here (a no-op for new
+    # databases). Existing chunks keep their size; only new chunks change.
+    op.execute("""
+        SELECT set_chunk_time_interval('crypto_prices', INTERVAL '30 days');
+    """)
+
+
+def downgrade() -> None:
+    """Restore the original 7-day chunk interval."""
+    op.execute("""
+        SELECT set_chunk_time_interval('crypto_prices', INTERVAL '7 days');
+    """)
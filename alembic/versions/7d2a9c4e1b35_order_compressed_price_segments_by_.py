@@ -0,0 +1,54 @@
+"""Order compressed crypto_prices segments by ascending timestamp
+
+Revision ID: 7d2a9c4e1b35
+Revises: 5c3e8f1a7b92
+Create Date: 2026-10-15 16:42:08.311947
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a9c4e1b35'
+down_revision: Union[str, None] = '5c3e8f1a7b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _set_compress_orderby(orderby: str) -> None:
+    """
+    Change the order of rows within compressed crypto_prices segments.
+
+    Compression settings cannot change while chunks are compressed, so all
+    chunks are decompressed first; the compression policy recompresses old
+    chunks with the new order on its next run.
+    """
+    op.execute("""
+        SELECT decompress_chunk(c, if_compressed => TRUE)
+        FROM show_chunks('crypto_prices') c;
+    """)
+    op.execute(f"""
+        ALTER TABLE crypto_prices SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'currency_id',
+            timescaledb.compress_orderby = '{orderby}'
+        );
+    """)
+
+
+def upgrade() -> None:
+    """Order compressed segments by ascending timestamp."""
+    # Matches the forward-time range scans the app runs, and lets late
+    # backfilled rows be recompressed segment by segment. Latest-first reads
+    # are served from ASC segments by timescaledb's sorted merge; the one
+    # expected regression is ORDER BY timestamp DESC without a currency_id
+    # filter, which has to merge every segment.
+    _set_compress_orderby("timestamp ASC")
+
+
+def downgrade() -> None:
+    """Restore descending timestamp order within compressed segments."""
+    _set_compress_orderby("timestamp DESC")
@@ -0,0 +1,52 @@
+"""Enable sorted merge for compressed chunk scans
+
+Revision ID: 9b4f6d1c2e80
+Revises: 7d2a9c4e1b35
+Create Date: 2026-10-15 16:58:47.902615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4f6d1c2e80'
+down_revision: Union[str, None] = '7d2a9c4e1b35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SORTED_MERGE_SETTING = "timescaledb.enable_decompression_sorted_merge"
+
+
+def _alter_database(action: str) -> None:
+    """
+    Apply an ALTER DATABASE ... SET/RESET of the sorted merge setting.
+
+    Only servers whose TimescaleDB knows the setting (2.9+) are changed, so
+    the migration still runs against older versions.
+    """
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_settings WHERE name = '{SORTED_MERGE_SETTING}') THEN
+                EXECUTE format('ALTER DATABASE %I {action}', current_database());
+            END IF;
+        END
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """Turn on sorted merge of compressed segments for new sessions."""
+    # Serves ORDER BY timestamp DESC from ASC-ordered compressed chunks with
+    # a heap merge instead of a full sort. Set per database, so every client
+    # gets it without passing connection options.
+    _alter_database(f"SET {SORTED_MERGE_SETTING} = on")
+
+
+def downgrade() -> None:
+    """Restore the server default for sorted merge."""
+    _alter_database(f"RESET {SORTED_MERGE_SETTING}")
@@ -18,18 +18,24 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+# One daily candle per tracked currency is a few KB per month, so chunks are
+# sized by lifecycle rather than memory: matching the 30-day compression delay
+# makes whole chunks eligible for compression and retention on schedule.
+# A fixed interval also keeps the migration's output independent of the server.
+CHUNK_TIME_INTERVAL = "30 days"
+
+
 def upgrade() -> None:
     """Convert crypto_prices table to TimescaleDB hypertable."""
     # Enable TimescaleDB extension
     op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE;")
 
     # Convert crypto_prices to hypertable partitioned by timestamp
-    # chunk_time_interval = 7 days (good for cryptocurrency data)
-    op.execute("""
+    op.execute(f"""
         SELECT create_hypertable(
             'crypto_prices',
             'timestamp',
-            chunk_time_interval => INTERVAL '7 days',
+            chunk_time_interval => INTERVAL '{CHUNK_TIME_INTERVAL}',
             if_not_exists => TRUE
         );
     """)
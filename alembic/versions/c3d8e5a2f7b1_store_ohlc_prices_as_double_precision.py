@@ -0,0 +1,112 @@
+"""Store OHLC prices as double precision again
+
+Revision ID: c3d8e5a2f7b1
+Revises: 9b4f6d1c2e80
+Create Date: 2026-10-15 17:25:51.048326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e5a2f7b1'
+down_revision: Union[str, None] = '9b4f6d1c2e80'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# Same definition as revision e288da3085a9; summing close as double precision
+# is a no-op for double columns and keeps the view valid after a downgrade
+CREATE_DAILY_AGGREGATE = """
+    CREATE MATERIALIZED VIEW crypto_prices_daily
+    WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+    SELECT
+        currency_id,
+        time_bucket(INTERVAL '1 day', timestamp) AS bucket,
+        first(open, timestamp) AS open,
+        max(high) AS high,
+        min(low) AS low,
+        last(close, timestamp) AS close,
+        sum(volume) AS volume,
+        sum(close::double precision) AS close_sum,
+        count(*) AS row_count
+    FROM crypto_prices
+    GROUP BY currency_id, bucket
+    WITH NO DATA;
+"""
+
+ADD_DAILY_AGGREGATE_POLICY = """
+    SELECT add_continuous_aggregate_policy(
+        'crypto_prices_daily',
+        start_offset => INTERVAL '30 days',
+        end_offset => INTERVAL '1 hour',
+        schedule_interval => INTERVAL '1 hour'
+    );
+"""
+
+REFRESH_DAILY_AGGREGATE = """
+    CALL refresh_continuous_aggregate('crypto_prices_daily', NULL, NULL);
+"""
+
+
+def _alter_price_columns(sql_type: str, using: str) -> None:
+    """
+    Change the OHLC column type on the crypto_prices hypertable.
+
+    Same procedure as revision e288da3085a9: the aggregate is dropped, all
+    chunks are decompressed and compression is switched off for the ALTER,
+    then everything is restored and the aggregate is refreshed over the
+    full history.
+    """
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS crypto_prices_daily;")
+    op.execute("""
+        SELECT remove_compression_policy('crypto_prices', if_exists => TRUE);
+    """)
+    op.execute("""
+        SELECT decompress_chunk(c, if_compressed => TRUE)
+        FROM show_chunks('crypto_prices') c;
+    """)
+    op.execute("ALTER TABLE crypto_prices SET (timescaledb.compress = false);")
+
+    for column in PRICE_COLUMNS:
+        op.execute(
+            f"ALTER TABLE crypto_prices ALTER COLUMN {column} "
+            f"TYPE {sql_type} USING {using.format(column=column)};"
+        )
+
+    op.execute("""
+        ALTER TABLE crypto_prices SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'currency_id',
+            timescaledb.compress_orderby = 'timestamp ASC'
+        );
+    """)
+    op.execute("""
+        SELECT add_compression_policy('crypto_prices', INTERVAL '30 days');
+    """)
+    op.execute(CREATE_DAILY_AGGREGATE)
+    op.execute(ADD_DAILY_AGGREGATE_POLICY)
+
+    # Refreshes cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(REFRESH_DAILY_AGGREGATE)
+
+
+def upgrade() -> None:
+    """Restore open/high/low/close to double precision."""
+    # real cannot hold 8-digit quotes exactly (67234.56 is stored as
+    # 67234.5625). Going through text recovers the shortest decimal that
+    # round-trips each real, which is the original quote for prices with up
+    # to 7 significant digits; a plain cast would keep the float4 noise.
+    # Prices stored as real with more digits need re-importing to be exact.
+    _alter_price_columns("double precision", "{column}::text::double precision")
+
+
+def downgrade() -> None:
+    """Store open/high/low/close as real again."""
+    _alter_price_columns("real", "{column}::real")
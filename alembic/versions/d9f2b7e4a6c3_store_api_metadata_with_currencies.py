@@ -0,0 +1,28 @@
+"""Store API metadata with currencies
+
+Revision ID: d9f2b7e4a6c3
+Revises: c3d8e5a2f7b1
+Create Date: 2026-10-15 17:48:13.572904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f2b7e4a6c3'
+down_revision: Union[str, None] = 'c3d8e5a2f7b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add crypto_currencies.api_metadata."""
+    op.add_column('crypto_currencies', sa.Column('api_metadata', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop crypto_currencies.api_metadata."""
+    op.drop_column('crypto_currencies', 'api_metadata')
@@ -0,0 +1,110 @@
+"""Store OHLC prices as real (float4)
+
+Revision ID: e288da3085a9
+Revises: 10dea3ee3245
+Create Date: 2026-10-15 11:20:37.934102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e288da3085a9'
+down_revision: Union[str, None] = '10dea3ee3245'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+# Same definition as revision 2355926f1f1a, except that close is summed as
+# double precision so averages over real prices do not lose precision
+CREATE_DAILY_AGGREGATE = """
+    CREATE MATERIALIZED VIEW crypto_prices_daily
+    WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+    SELECT
+        currency_id,
+        time_bucket(INTERVAL '1 day', timestamp) AS bucket,
+        first(open, timestamp) AS open,
+        max(high) AS high,
+        min(low) AS low,
+        last(close, timestamp) AS close,
+        sum(volume) AS volume,
+        sum(close::double precision) AS close_sum,
+        count(*) AS row_count
+    FROM crypto_prices
+    GROUP BY currency_id, bucket
+    WITH NO DATA;
+"""
+
+ADD_DAILY_AGGREGATE_POLICY = """
+    SELECT add_continuous_aggregate_policy(
+        'crypto_prices_daily',
+        start_offset => INTERVAL '30 days',
+        end_offset => INTERVAL '1 hour',
+        schedule_interval => INTERVAL '1 hour'
+    );
+"""
+
+REFRESH_DAILY_AGGREGATE = """
+    CALL refresh_continuous_aggregate('crypto_prices_daily', NULL, NULL);
+"""
+
+
+def _alter_price_columns(sql_type: str) -> None:
+    """
+    Change the OHLC column type on the crypto_prices hypertable.
+
+    Column types cannot change while compression is enabled or while a
+    continuous aggregate depends on them, so the aggregate is dropped, all
+    chunks are decompressed and compression is switched off for the ALTER.
+    Everything is restored afterwards; the compression policy recompresses
+    old chunks on its next run, and the recreated aggregate is refreshed
+    over the full history (its policy only covers the last 30 days).
+    """
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS crypto_prices_daily;")
+    op.execute("""
+        SELECT remove_compression_policy('crypto_prices', if_exists => TRUE);
+    """)
+    op.execute("""
+        SELECT decompress_chunk(c, if_compressed => TRUE)
+        FROM show_chunks('crypto_prices') c;
+    """)
+    op.execute("ALTER TABLE crypto_prices SET (timescaledb.compress = false);")
+
+    for column in PRICE_COLUMNS:
+        op.execute(
+            f"ALTER TABLE crypto_prices ALTER COLUMN {column} "
+            f"TYPE {sql_type} USING {column}::{sql_type};"
+        )
+
+    op.execute("""
+        ALTER TABLE crypto_prices SET (
+            timescaledb.compress,
+            timescaledb.compress_segmentby = 'currency_id',
+            timescaledb.compress_orderby = 'timestamp DESC'
+        );
+    """)
+    op.execute("""
+        SELECT add_compression_policy('crypto_prices', INTERVAL '30 days');
+    """)
+    op.execute(CREATE_DAILY_AGGREGATE)
+    op.execute(ADD_DAILY_AGGREGATE_POLICY)
+
+    # Refreshes cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(REFRESH_DAILY_AGGREGATE)
+
+
+def upgrade() -> None:
+    """Downgrade open/high/low/close from double precision to real."""
+    # volume stays double precision: it can exceed real's 24-bit mantissa
+    _alter_price_columns("real")
+
+
+def downgrade() -> None:
+    """Restore open/high/low/close to double precision."""
+    _alter_price_columns("double precision")
@@ -2,7 +2,7 @@
 Configuration module for the FastAPI application.
 Loads environment variables and provides application settings.
 """
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
 
@@ -15,6 +15,11 @@ class Settings(BaseSettings):
     default_market: str = Field(default="USD", alias="DEFAULT_MARKET")
     alphavantage_base_url: str = "https://www.alphavantage.co/query"
 
+    # AlphaVantage quota (per API key) and maximum in-flight requests
+    alphavantage_requests_per_minute: int = Field(default=5, alias="ALPHAVANTAGE_REQUESTS_PER_MINUTE")
+    alphavantage_max_concurrency: int = Field(default=5, alias="ALPHAVANTAGE_MAX_CONCURRENCY")
+    alphavantage_cache_ttl: int = Field(default=300, alias="ALPHAVANTAGE_CACHE_TTL")  # Seconds
+
     # Database configuration
     database_url: str = Field(..., alias="DATABASE_URL")
     postgres_db: str = Field(..., alias="POSTGRES_DB")
@@ -25,11 +30,10 @@ class Settings(BaseSettings):
     db_pool_size: int = Field(default=5, alias="DB_POOL_SIZE")
     db_max_overflow: int = Field(default=10, alias="DB_MAX_OVERFLOW")
     db_pool_timeout: int = Field(default=30, alias="DB_POOL_TIMEOUT")
+    db_connect_timeout: int = Field(default=5, alias="DB_CONNECT_TIMEOUT")  # Seconds, async engine
     db_echo: bool = Field(default=False, alias="DB_ECHO")  # Log SQL queries
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 
 # Global settings instance
@@ -1,6 +1,22 @@
 """
 Database package for managing PostgreSQL connections and sessions.
 """
-from app.database.session import engine, SessionLocal, get_db, init_db
+from app.database.session import (
+    engine,
+    SessionLocal,
+    get_db,
+    init_db,
+    get_async_engine,
+    get_async_session_factory,
+    get_async_db,
+)
 
-__all__ = ["engine", "SessionLocal", "get_db", "init_db"]
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "get_db",
+    "init_db",
+    "get_async_engine",
+    "get_async_session_factory",
+    "get_async_db",
+]
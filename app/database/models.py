@@ -15,14 +15,41 @@ from sqlalchemy import (
     UniqueConstraint,
     Text,
     Boolean,
+    BigInteger,
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, table, column
 from datetime import datetime
 
 from app.database.session import Base
 
 
+# Columns serialized by to_dict(). Datetime columns are returned as ISO 8601
+# strings, so the dicts stay encodable with the stdlib json module.
+_CURRENCY_FIELDS = ("id", "symbol", "name", "market", "is_active", "created_at", "updated_at")
+_PRICE_FIELDS = ("id", "currency_id", "timestamp", "open", "high", "low", "close", "volume", "created_at")
+_INDICATOR_FIELDS = (
+    "id",
+    "currency_id",
+    "timestamp",
+    "indicator_type",
+    "indicator_name",
+    "value",
+    "parameters",
+    "created_at",
+)
+_DATETIME_FIELDS = frozenset(("timestamp", "created_at", "updated_at"))
+
+
+def _model_to_dict(model, fields) -> dict:
+    """Read fields from a model instance, converting datetimes to ISO strings."""
+    data = {field: getattr(model, field) for field in fields}
+    for field in _DATETIME_FIELDS.intersection(fields):
+        value = data[field]
+        data[field] = value.isoformat() if value else None
+    return data
+
+
 class CryptoCurrency(Base):
     """
     Model representing a cryptocurrency.
@@ -36,6 +63,7 @@ class CryptoCurrency(Base):
         name: Full name (Bitcoin, Ethereum, etc.)
         market: Market currency (USD, EUR, etc.)
         is_active: Whether we're actively tracking this crypto
+        api_metadata: JSON string of the AlphaVantage "Meta Data" stored with the prices
         created_at: When the record was created
         updated_at: When the record was last updated
         prices: Relationship to CryptoPrice records
@@ -48,6 +76,9 @@ class CryptoCurrency(Base):
     name = Column(String(100), nullable=False)
     market = Column(String(10), nullable=False, default="USD")
     is_active = Column(Boolean, default=True, nullable=False)
+    # Kept so responses built from stored prices carry the same metadata as
+    # responses built from the API
+    api_metadata = Column(Text, nullable=True)  # JSON string
 
     # Timestamps
     created_at = Column(
@@ -80,15 +111,7 @@ class CryptoCurrency(Base):
 
     def to_dict(self):
         """Convert model to dictionary."""
-        return {
-            "id": self.id,
-            "symbol": self.symbol,
-            "name": self.name,
-            "market": self.market,
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+        return _model_to_dict(self, _CURRENCY_FIELDS)
 
 
 class CryptoPrice(Base):
@@ -114,11 +137,12 @@ class CryptoPrice(Base):
     __tablename__ = "crypto_prices"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    # Not individually indexed: idx_currency_timestamp and uq_currency_timestamp
+    # lead with currency_id
     currency_id = Column(
         Integer,
         ForeignKey("crypto_currencies.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
 
     # Time-series data
@@ -152,17 +176,7 @@ class CryptoPrice(Base):
 
     def to_dict(self):
         """Convert model to dictionary."""
-        return {
-            "id": self.id,
-            "currency_id": self.currency_id,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-            "open": self.open,
-            "high": self.high,
-            "low": self.low,
-            "close": self.close,
-            "volume": self.volume,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
+        return _model_to_dict(self, _PRICE_FIELDS)
 
 
 class ComputedIndicator(Base):
@@ -228,16 +242,7 @@ class ComputedIndicator(Base):
 
     def to_dict(self):
         """Convert model to dictionary."""
-        return {
-            "id": self.id,
-            "currency_id": self.currency_id,
-            "timestamp": self.timestamp.isoformat() if self.timestamp else None,
-            "indicator_type": self.indicator_type,
-            "indicator_name": self.indicator_name,
-            "value": self.value,
-            "parameters": self.parameters,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
+        return _model_to_dict(self, _INDICATOR_FIELDS)
 
 
 # Note: After creating these models, we need to convert crypto_prices to a TimescaleDB hypertable.
@@ -250,3 +255,20 @@ class ComputedIndicator(Base):
 # - Improved query performance for time-series data
 # - Data retention policies
 # - Continuous aggregates
+
+
+# Daily OHLCV continuous aggregate over crypto_prices (created by Alembic).
+# Declared as a lightweight table clause so it stays out of Base.metadata and
+# init_db() never tries to create it as a regular table.
+crypto_prices_daily = table(
+    "crypto_prices_daily",
+    column("currency_id", Integer),
+    column("bucket", DateTime(timezone=True)),
+    column("open", Float),
+    column("high", Float),
+    column("low", Float),
+    column("close", Float),
+    column("volume", Float),
+    column("close_sum", Float),
+    column("row_count", BigInteger),
+)
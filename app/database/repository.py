@@ -1,13 +1,119 @@
 """
 Repository pattern for database operations.
 Provides CRUD operations for CryptoCurrency, CryptoPrice, and ComputedIndicator models.
+
+Hot point and range lookups are built with lambda_stmt, so SQLAlchemy caches
+the compiled SQL per call site and only re-binds the closure values.
 """
-from typing import List, Optional
-from datetime import datetime
+import io
+import struct
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, time, timezone
+import numpy as np
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
-
-from app.database.models import CryptoCurrency, CryptoPrice, ComputedIndicator
+from sqlalchemy import and_, desc, func, insert, lambda_stmt, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.database.models import (
+    CryptoCurrency,
+    CryptoPrice,
+    ComputedIndicator,
+    crypto_prices_daily,
+)
+
+# (symbol, market) -> currency id. Currencies change very rarely, so long-running
+# importers and dashboards resolve ids from memory instead of a SELECT per batch.
+_currency_id_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_currency_id_cache_lock = threading.Lock()
+
+# Rows fetched per round trip when streaming price ranges through a server-side cursor
+STREAM_BATCH_SIZE = 10_000
+
+# Batches larger than this are streamed with COPY instead of INSERT statements
+COPY_THRESHOLD = 500
+
+# PostgreSQL binary COPY framing: signature, flags and header-extension length,
+# and the -1 field count that marks the end of the stream
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+# One crypto_prices row: field count, then (length, value) pairs for
+# currency_id (int4), timestamp (timestamptz), OHLC and volume (5 x float8)
+_PRICE_ROW = struct.Struct("!h" + "ii" + "iq" + "id" * 5)
+_PRICE_COLUMNS = "currency_id, timestamp, open, high, low, close, volume"
+
+# COPY cannot skip conflicting rows, so batches are staged in a temp table and
+# merged with ON CONFLICT DO NOTHING to keep re-ingest idempotent
+_PRICE_STAGE_SQL = (
+    "CREATE TEMP TABLE crypto_prices_stage ("
+    "currency_id integer, timestamp timestamptz, open double precision, "
+    "high double precision, low double precision, close double precision, "
+    "volume double precision"
+    ") ON COMMIT DROP"
+)
+_PRICE_COPY_SQL = (
+    f"COPY crypto_prices_stage ({_PRICE_COLUMNS}) FROM STDIN WITH (FORMAT BINARY)"
+)
+_PRICE_MERGE_SQL = (
+    f"INSERT INTO crypto_prices ({_PRICE_COLUMNS}) "
+    f"SELECT {_PRICE_COLUMNS} FROM crypto_prices_stage "
+    "ON CONFLICT (currency_id, timestamp) DO NOTHING"
+)
+
+# timestamptz values are sent as microseconds since 2000-01-01 UTC
+_PG_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def _pg_timestamp(value: datetime) -> int:
+    """Convert a datetime to PostgreSQL's binary timestamptz (naive values are UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _PG_EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _encode_price_copy(price_records: Iterable[dict]) -> io.BytesIO:
+    """Encode price records as a binary COPY stream for crypto_prices."""
+    pack = _PRICE_ROW.pack
+    buf = io.BytesIO()
+    buf.write(_COPY_HEADER)
+    for record in price_records:
+        buf.write(
+            pack(
+                7,
+                4, record["currency_id"],
+                8, _pg_timestamp(record["timestamp"]),
+                8, record["open"],
+                8, record["high"],
+                8, record["low"],
+                8, record["close"],
+                8, record["volume"],
+            )
+        )
+    buf.write(_COPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+def _is_whole_day_range(start_date: datetime, end_date: datetime) -> bool:
+    """
+    Check that [start_date, end_date] spans whole UTC days.
+
+    The range must start at midnight and end on the last microsecond of a
+    day, as date pickers combined with time.min/time.max produce. Naive
+    values are UTC.
+    """
+    if start_date.tzinfo is not None:
+        start_date = start_date.astimezone(timezone.utc)
+    if end_date.tzinfo is not None:
+        end_date = end_date.astimezone(timezone.utc)
+    return (
+        start_date < end_date
+        and start_date.time() == time.min
+        and end_date.time() == time.max
+    )
 
 
 class CryptoCurrencyRepository:
@@ -16,23 +122,60 @@ class CryptoCurrencyRepository:
     @staticmethod
     def get_by_id(db: Session, currency_id: int) -> Optional[CryptoCurrency]:
         """Get cryptocurrency by ID."""
-        return db.query(CryptoCurrency).filter(CryptoCurrency.id == currency_id).first()
+        stmt = lambda_stmt(
+            lambda: select(CryptoCurrency).where(CryptoCurrency.id == currency_id)
+        )
+        return db.execute(stmt).scalars().first()
 
     @staticmethod
     def get_by_symbol_and_market(
         db: Session, symbol: str, market: str
     ) -> Optional[CryptoCurrency]:
         """Get cryptocurrency by symbol and market."""
-        return (
-            db.query(CryptoCurrency)
+        symbol, market = symbol.upper(), market.upper()
+        stmt = lambda_stmt(
+            lambda: select(CryptoCurrency)
+            .where(
+                and_(
+                    CryptoCurrency.symbol == symbol,
+                    CryptoCurrency.market == market,
+                )
+            )
+            .limit(1)
+        )
+        return db.execute(stmt).scalars().first()
+
+    @staticmethod
+    def get_id_by_symbol_and_market(
+        db: Session, symbol: str, market: str
+    ) -> Optional[int]:
+        """Get cryptocurrency ID by symbol and market, cached in-process."""
+        key = (symbol.upper(), market.upper())
+        with _currency_id_cache_lock:
+            currency_id = _currency_id_cache.get(key)
+        if currency_id is not None:
+            return currency_id
+
+        currency_id = (
+            db.query(CryptoCurrency.id)
             .filter(
                 and_(
-                    CryptoCurrency.symbol == symbol.upper(),
-                    CryptoCurrency.market == market.upper(),
+                    CryptoCurrency.symbol == key[0],
+                    CryptoCurrency.market == key[1],
                 )
             )
-            .first()
+            .scalar()
         )
+        if currency_id is not None:
+            with _currency_id_cache_lock:
+                _currency_id_cache[key] = currency_id
+        return currency_id
+
+    @staticmethod
+    def invalidate_cached_id(symbol: str, market: str) -> None:
+        """Drop a cached (symbol, market) -> ID entry."""
+        with _currency_id_cache_lock:
+            _currency_id_cache.pop((symbol.upper(), market.upper()), None)
 
     @staticmethod
     def get_all(
@@ -49,27 +192,50 @@ class CryptoCurrencyRepository:
         db: Session, symbol: str, name: str, market: str, is_active: bool = True
     ) -> CryptoCurrency:
         """Create a new cryptocurrency."""
-        currency = CryptoCurrency(
-            symbol=symbol.upper(),
-            name=name,
-            market=market.upper(),
-            is_active=is_active,
+        # INSERT ... RETURNING brings back the id and server-generated
+        # timestamps in the same round trip
+        stmt = (
+            insert(CryptoCurrency)
+            .values(
+                symbol=symbol.upper(),
+                name=name,
+                market=market.upper(),
+                is_active=is_active,
+            )
+            .returning(CryptoCurrency)
         )
-        db.add(currency)
+        currency = db.execute(stmt).scalar_one()
         db.commit()
-        db.refresh(currency)
+        CryptoCurrencyRepository.invalidate_cached_id(symbol, market)
         return currency
 
     @staticmethod
     def get_or_create(
         db: Session, symbol: str, name: str, market: str
     ) -> CryptoCurrency:
-        """Get existing cryptocurrency or create if it doesn't exist."""
-        currency = CryptoCurrencyRepository.get_by_symbol_and_market(
-            db, symbol, market
+        """
+        Get existing cryptocurrency or create if it doesn't exist.
+
+        Runs as a single INSERT ... ON CONFLICT (symbol, market) DO UPDATE
+        ... RETURNING statement. The no-op update makes RETURNING yield the
+        existing row on conflict, so both paths take one round trip.
+        """
+        stmt = pg_insert(CryptoCurrency).values(
+            symbol=symbol.upper(),
+            name=name,
+            market=market.upper(),
+            is_active=True,
         )
-        if not currency:
-            currency = CryptoCurrencyRepository.create(db, symbol, name, market)
+        stmt = (
+            stmt.on_conflict_do_update(
+                index_elements=["symbol", "market"],
+                set_={"symbol": stmt.excluded.symbol},
+            )
+            .returning(CryptoCurrency)
+            .execution_options(populate_existing=True)
+        )
+        currency = db.execute(stmt).scalar_one()
+        db.commit()
         return currency
 
     @staticmethod
@@ -78,6 +244,7 @@ class CryptoCurrencyRepository:
         currency_id: int,
         name: Optional[str] = None,
         is_active: Optional[bool] = None,
+        api_metadata: Optional[str] = None,
     ) -> Optional[CryptoCurrency]:
         """Update cryptocurrency information."""
         currency = CryptoCurrencyRepository.get_by_id(db, currency_id)
@@ -88,22 +255,33 @@ class CryptoCurrencyRepository:
             currency.name = name
         if is_active is not None:
             currency.is_active = is_active
+        if api_metadata is not None:
+            currency.api_metadata = api_metadata
 
-        currency.updated_at = datetime.utcnow()
+        # updated_at is set by the column's onupdate=func.now() on the server
         db.commit()
-        db.refresh(currency)
+        CryptoCurrencyRepository.invalidate_cached_id(
+            currency.symbol, currency.market
+        )
         return currency
 
     @staticmethod
     def delete(db: Session, currency_id: int) -> bool:
         """Delete a cryptocurrency (soft delete by marking as inactive)."""
-        currency = CryptoCurrencyRepository.get_by_id(db, currency_id)
-        if not currency:
+        # Single UPDATE ... RETURNING, without loading the row first
+        stmt = (
+            update(CryptoCurrency)
+            .where(CryptoCurrency.id == currency_id)
+            .values(is_active=False, updated_at=func.now())
+            .returning(CryptoCurrency.symbol, CryptoCurrency.market)
+            .execution_options(synchronize_session=False)
+        )
+        row = db.execute(stmt).first()
+        db.commit()
+        if row is None:
             return False
 
-        currency.is_active = False
-        currency.updated_at = datetime.utcnow()
-        db.commit()
+        CryptoCurrencyRepository.invalidate_cached_id(row.symbol, row.market)
         return True
 
 
@@ -113,20 +291,53 @@ class CryptoPriceRepository:
     @staticmethod
     def get_by_id(db: Session, price_id: int) -> Optional[CryptoPrice]:
         """Get price record by ID."""
-        return db.query(CryptoPrice).filter(CryptoPrice.id == price_id).first()
+        stmt = lambda_stmt(
+            lambda: select(CryptoPrice).where(CryptoPrice.id == price_id).limit(1)
+        )
+        return db.execute(stmt).scalars().first()
 
     @staticmethod
     def get_latest(
         db: Session, currency_id: int, limit: int = 1
     ) -> List[CryptoPrice]:
         """Get latest price(s) for a cryptocurrency."""
-        return (
-            db.query(CryptoPrice)
-            .filter(CryptoPrice.currency_id == currency_id)
+        stmt = lambda_stmt(
+            lambda: select(CryptoPrice)
+            .where(CryptoPrice.currency_id == currency_id)
             .order_by(desc(CryptoPrice.timestamp))
             .limit(limit)
-            .all()
         )
+        return list(db.execute(stmt).scalars())
+
+    @staticmethod
+    def iter_by_date_range(
+        db: Session,
+        currency_id: int,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Iterator[CryptoPrice]:
+        """
+        Iterate over price data for a specific date range.
+
+        Rows are streamed through a server-side cursor in batches of
+        STREAM_BATCH_SIZE, so memory stays flat however long the range is.
+        Consume the iterator before closing the session.
+        """
+        stmt = lambda_stmt(
+            lambda: select(CryptoPrice)
+            .where(
+                and_(
+                    CryptoPrice.currency_id == currency_id,
+                    CryptoPrice.timestamp >= start_date,
+                    CryptoPrice.timestamp <= end_date,
+                )
+            )
+            .order_by(CryptoPrice.timestamp)
+        )
+        result = db.execute(
+            stmt, execution_options={"yield_per": STREAM_BATCH_SIZE}
+        )
+        yield from result.scalars()
 
     @staticmethod
     def get_by_date_range(
@@ -136,9 +347,78 @@ class CryptoPriceRepository:
         end_date: datetime,
     ) -> List[CryptoPrice]:
         """Get price data for a specific date range."""
-        return (
-            db.query(CryptoPrice)
-            .filter(
+        return list(
+            CryptoPriceRepository.iter_by_date_range(
+                db, currency_id, start_date, end_date
+            )
+        )
+
+    @staticmethod
+    def get_closes_by_symbols_and_date_range(
+        db: Session,
+        symbols: List[str],
+        market: str,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[Tuple[str, datetime, float]]:
+        """
+        Get (symbol, timestamp, close) rows for several currencies.
+
+        One joined query replaces a lookup plus a range query per currency,
+        for comparison views. Timestamps are naive UTC.
+
+        Returns:
+            Rows ordered by symbol, then chronologically
+        """
+        stmt = (
+            select(
+                CryptoCurrency.symbol,
+                func.timezone("UTC", CryptoPrice.timestamp),
+                CryptoPrice.close,
+            )
+            .join(CryptoCurrency, CryptoCurrency.id == CryptoPrice.currency_id)
+            .where(
+                and_(
+                    CryptoCurrency.symbol.in_(symbols),
+                    CryptoCurrency.market == market,
+                    CryptoPrice.timestamp >= start_date,
+                    CryptoPrice.timestamp <= end_date,
+                )
+            )
+            .order_by(CryptoCurrency.symbol, CryptoPrice.timestamp)
+        )
+        return db.execute(stmt).all()
+
+    @staticmethod
+    def get_ohlcv_arrays(
+        db: Session,
+        currency_id: int,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get price data for a date range as column arrays.
+
+        Rows are streamed through a server-side cursor and packed straight
+        into NumPy arrays without hydrating ORM objects, which is the layout
+        vectorized indicator code wants.
+
+        Returns:
+            dict with a "timestamp" datetime64[us] array (UTC) and contiguous
+            float64 "open", "high", "low", "close" and "volume" arrays, in
+            chronological order
+        """
+        stmt = (
+            select(
+                # Naive UTC on the server side, since datetime64 has no time zone
+                func.timezone("UTC", CryptoPrice.timestamp),
+                CryptoPrice.open,
+                CryptoPrice.high,
+                CryptoPrice.low,
+                CryptoPrice.close,
+                CryptoPrice.volume,
+            )
+            .where(
                 and_(
                     CryptoPrice.currency_id == currency_id,
                     CryptoPrice.timestamp >= start_date,
@@ -146,9 +426,30 @@ class CryptoPriceRepository:
                 )
             )
             .order_by(CryptoPrice.timestamp)
-            .all()
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
         )
 
+        timestamp_chunks = [np.empty(0, dtype="datetime64[us]")]
+        value_chunks = [np.empty((0, 5), dtype=np.float64)]
+        for partition in db.execute(stmt).partitions():
+            timestamp_chunks.append(
+                np.array([row[0] for row in partition], dtype="datetime64[us]")
+            )
+            value_chunks.append(
+                np.array([tuple(row[1:]) for row in partition], dtype=np.float64)
+            )
+
+        # Transpose and copy so each column is contiguous in memory
+        columns = np.concatenate(value_chunks).T.copy()
+        return {
+            "timestamp": np.concatenate(timestamp_chunks),
+            "open": columns[0],
+            "high": columns[1],
+            "low": columns[2],
+            "close": columns[3],
+            "volume": columns[4],
+        }
+
     @staticmethod
     def get_recent(
         db: Session, currency_id: int, days: int = 30
@@ -175,48 +476,90 @@ class CryptoPriceRepository:
         volume: float,
     ) -> CryptoPrice:
         """Create a new price record."""
-        price = CryptoPrice(
-            currency_id=currency_id,
-            timestamp=timestamp,
-            open=open,
-            high=high,
-            low=low,
-            close=close,
-            volume=volume,
+        stmt = (
+            insert(CryptoPrice)
+            .values(
+                currency_id=currency_id,
+                timestamp=timestamp,
+                open=open,
+                high=high,
+                low=low,
+                close=close,
+                volume=volume,
+            )
+            .returning(CryptoPrice)
         )
-        db.add(price)
+        price = db.execute(stmt).scalar_one()
         db.commit()
-        db.refresh(price)
         return price
 
     @staticmethod
     def bulk_create(
         db: Session, price_records: List[dict]
     ) -> int:
-        """Bulk insert price records. Returns count of inserted records."""
+        """
+        Bulk insert price records. Returns count of inserted records.
+
+        Rows that already exist for the same (currency_id, timestamp) are
+        skipped, so re-running an import is idempotent.
+        """
+        if not price_records:
+            return 0
+
+        if len(price_records) > COPY_THRESHOLD:
+            return CryptoPriceRepository.bulk_copy(db, price_records)
+
+        stmt = (
+            pg_insert(CryptoPrice)
+            .values(price_records)
+            .on_conflict_do_nothing(index_elements=["currency_id", "timestamp"])
+        )
+        result = db.execute(stmt)
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def bulk_copy(
+        db: Session, price_records: List[dict]
+    ) -> int:
+        """
+        Stream price records into crypto_prices with binary COPY.
+
+        Bypasses the ORM and per-row INSERT statements entirely, which makes
+        large backfills into the hypertable I/O-bound rather than CPU-bound.
+        Existing (currency_id, timestamp) rows are skipped. Returns count of
+        inserted records.
+        """
         if not price_records:
             return 0
 
-        price_objects = [CryptoPrice(**record) for record in price_records]
-        db.bulk_save_objects(price_objects)
+        buf = _encode_price_copy(price_records)
+        # Raw psycopg2 connection bound to the session's current transaction
+        dbapi_conn = db.connection().connection
+        with dbapi_conn.cursor() as cursor:
+            cursor.execute(_PRICE_STAGE_SQL)
+            cursor.copy_expert(_PRICE_COPY_SQL, buf)
+            cursor.execute(_PRICE_MERGE_SQL)
+            inserted = cursor.rowcount
         db.commit()
-        return len(price_objects)
+        return inserted
 
     @staticmethod
     def get_price_at_timestamp(
         db: Session, currency_id: int, timestamp: datetime
     ) -> Optional[CryptoPrice]:
         """Get price at a specific timestamp."""
-        return (
-            db.query(CryptoPrice)
-            .filter(
+        stmt = lambda_stmt(
+            lambda: select(CryptoPrice)
+            .where(
                 and_(
                     CryptoPrice.currency_id == currency_id,
                     CryptoPrice.timestamp == timestamp,
                 )
             )
-            .first()
+            .limit(1)
         )
+        return db.execute(stmt).scalars().first()
 
     @staticmethod
     def get_stats(
@@ -225,34 +568,154 @@ class CryptoPriceRepository:
         start_date: datetime,
         end_date: datetime,
     ) -> dict:
-        """Get statistics for a currency in a date range."""
-        from sqlalchemy import func
-
-        result = (
-            db.query(
-                func.avg(CryptoPrice.close).label("avg_price"),
-                func.max(CryptoPrice.high).label("max_price"),
-                func.min(CryptoPrice.low).label("min_price"),
-                func.avg(CryptoPrice.volume).label("avg_volume"),
-                func.count().label("count"),
+        """
+        Get statistics for a currency in a date range.
+
+        Everything is aggregated server-side. Ranges made of whole UTC days
+        are answered from the crypto_prices_daily continuous aggregate
+        instead of scanning the hypertable: every bucket they touch lies
+        entirely inside the range, so the buckets hold exactly the rows of
+        the raw range, whatever time of day prices are stamped at.
+        """
+        if _is_whole_day_range(start_date, end_date):
+            daily = crypto_prices_daily.c
+            result = (
+                db.query(
+                    (func.sum(daily.close_sum) / func.sum(daily.row_count)).label("avg_price"),
+                    func.max(daily.high).label("max_price"),
+                    func.min(daily.low).label("min_price"),
+                    (func.sum(daily.volume) / func.sum(daily.row_count)).label("avg_volume"),
+                    func.coalesce(func.sum(daily.row_count), 0).label("count"),
+                )
+                .filter(
+                    and_(
+                        daily.currency_id == currency_id,
+                        daily.bucket >= start_date,
+                        daily.bucket <= end_date,
+                    )
+                )
+                .first()
             )
-            .filter(
-                and_(
-                    CryptoPrice.currency_id == currency_id,
-                    CryptoPrice.timestamp >= start_date,
-                    CryptoPrice.timestamp <= end_date,
+        else:
+            result = (
+                db.query(
+                    func.avg(CryptoPrice.close).label("avg_price"),
+                    func.max(CryptoPrice.high).label("max_price"),
+                    func.min(CryptoPrice.low).label("min_price"),
+                    func.avg(CryptoPrice.volume).label("avg_volume"),
+                    func.count().label("count"),
+                )
+                .filter(
+                    and_(
+                        CryptoPrice.currency_id == currency_id,
+                        CryptoPrice.timestamp >= start_date,
+                        CryptoPrice.timestamp <= end_date,
+                    )
                 )
+                .first()
             )
-            .first()
-        )
 
         return {
             "avg_price": float(result.avg_price) if result.avg_price else None,
             "max_price": float(result.max_price) if result.max_price else None,
             "min_price": float(result.min_price) if result.min_price else None,
             "avg_volume": float(result.avg_volume) if result.avg_volume else None,
-            "count": result.count,
+            "count": int(result.count),
+        }
+
+    @staticmethod
+    def get_close_volume_stats(
+        db: Session,
+        currency_id: int,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Optional[float]]:
+        """
+        Get descriptive statistics of closes and volumes in a date range.
+
+        Latest value, mean, median, sample standard deviation, min and max of
+        both columns are aggregated server-side in one query, so callers do
+        not need to load the rows.
+
+        Returns:
+            Dict with "<stat>_close" and "<stat>_volume" keys, plus "count"
+        """
+        columns = []
+        for name, col in (("close", CryptoPrice.close), ("volume", CryptoPrice.volume)):
+            columns += [
+                func.last(col, CryptoPrice.timestamp).label(f"latest_{name}"),
+                func.avg(col).label(f"mean_{name}"),
+                func.percentile_cont(0.5).within_group(col).label(f"median_{name}"),
+                func.stddev_samp(col).label(f"std_{name}"),
+                func.min(col).label(f"min_{name}"),
+                func.max(col).label(f"max_{name}"),
+            ]
+
+        stmt = select(*columns, func.count().label("count")).where(
+            and_(
+                CryptoPrice.currency_id == currency_id,
+                CryptoPrice.timestamp >= start_date,
+                CryptoPrice.timestamp <= end_date,
+            )
+        )
+        result = db.execute(stmt).one()._asdict()
+
+        count = int(result.pop("count"))
+        stats = {
+            key: float(value) if value is not None else None
+            for key, value in result.items()
         }
+        stats["count"] = count
+        return stats
+
+
+class CryptoMetricsRepository:
+    """Repository for precomputed metrics read from continuous aggregates."""
+
+    @staticmethod
+    def get_latest(
+        db: Session, currency_id: int, days: int = 30
+    ) -> List[Tuple[datetime, float, float, float, float, float]]:
+        """
+        Get the most recent daily OHLCV rollups for a cryptocurrency.
+
+        Reads the crypto_prices_daily continuous aggregate, so each day is one
+        indexed row however many raw prices it was built from.
+
+        Returns:
+            (bucket, open, high, low, close, volume) rows, most recent first
+        """
+        daily = crypto_prices_daily.c
+        stmt = (
+            select(
+                daily.bucket,
+                daily.open,
+                daily.high,
+                daily.low,
+                daily.close,
+                daily.volume,
+            )
+            .where(daily.currency_id == currency_id)
+            .order_by(desc(daily.bucket))
+            .limit(days)
+        )
+        return [tuple(row) for row in db.execute(stmt)]
+
+    @staticmethod
+    def refresh_daily(db: Session) -> None:
+        """
+        Materialize crypto_prices_daily over the full price history.
+
+        The refresh policy only covers the last 30 days, so history loaded in
+        bulk (seeding, backfills) must be materialized explicitly. The refresh
+        cannot run inside a transaction: pending session work is committed
+        and the refresh runs on its own autocommit connection.
+        """
+        db.commit()
+        with db.get_bind().connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+                text("CALL refresh_continuous_aggregate('crypto_prices_daily', NULL, NULL)")
+            )
 
 
 class ComputedIndicatorRepository:
@@ -323,17 +786,20 @@ class ComputedIndicatorRepository:
         parameters: Optional[str] = None,
     ) -> ComputedIndicator:
         """Create a new computed indicator."""
-        indicator = ComputedIndicator(
-            currency_id=currency_id,
-            timestamp=timestamp,
-            indicator_type=indicator_type,
-            indicator_name=indicator_name,
-            value=value,
-            parameters=parameters,
+        stmt = (
+            insert(ComputedIndicator)
+            .values(
+                currency_id=currency_id,
+                timestamp=timestamp,
+                indicator_type=indicator_type,
+                indicator_name=indicator_name,
+                value=value,
+                parameters=parameters,
+            )
+            .returning(ComputedIndicator)
         )
-        db.add(indicator)
+        indicator = db.execute(stmt).scalar_one()
         db.commit()
-        db.refresh(indicator)
         return indicator
 
     @staticmethod
@@ -344,12 +810,11 @@ class ComputedIndicatorRepository:
         if not indicator_records:
             return 0
 
-        indicator_objects = [
-            ComputedIndicator(**record) for record in indicator_records
-        ]
-        db.bulk_save_objects(indicator_objects)
+        # Core executemany: no ORM objects are built, and the dialect batches
+        # the rows into multi-row VALUES statements
+        db.execute(insert(ComputedIndicator), indicator_records)
         db.commit()
-        return len(indicator_objects)
+        return len(indicator_records)
 
     @staticmethod
     def delete_by_currency_and_date_range(
@@ -382,5 +847,6 @@ def get_repositories(db: Session) -> dict:
     return {
         "currency": CryptoCurrencyRepository,
         "price": CryptoPriceRepository,
+        "metrics": CryptoMetricsRepository,
         "indicator": ComputedIndicatorRepository,
     }
@@ -2,12 +2,20 @@
 Database session management and connection pooling.
 Handles SQLAlchemy engine creation and session lifecycle.
 """
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import Pool
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 import logging
+import threading
 
 from app.config import settings
 
@@ -24,39 +32,113 @@ engine = create_engine(
     echo=settings.db_echo,  # Log SQL queries (useful for development)
 )
 
-# Add connection pool event listeners for monitoring (useful for learning/debugging)
-@event.listens_for(Pool, "connect")
+# DATABASE_URL query parameters the asyncpg dialect can pass on as connect
+# arguments. libpq's sslmode maps to asyncpg's ssl, which takes the same mode
+# names; any other libpq-only parameter would make asyncpg reject the connection.
+_ASYNCPG_URL_PARAMS = frozenset(("ssl", "prepared_statement_cache_size"))
+_LIBPQ_TO_ASYNCPG_PARAMS = {"sslmode": "ssl"}
+
+# Built on first use by get_async_engine()
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+_async_engine_lock = threading.Lock()
+
+# Health-check statement, built once and reused (its compiled form is cached)
+_PING_STMT = text("SELECT 1")
+
+# Connection pool event listeners for monitoring (useful for learning/debugging)
 def receive_connect(dbapi_conn, connection_record):
     """Log when a new database connection is established."""
     logger.debug("Database connection established")
 
 
-@event.listens_for(Pool, "checkout")
 def receive_checkout(dbapi_conn, connection_record, connection_proxy):
     """Log when a connection is checked out from the pool."""
     logger.debug("Connection checked out from pool")
 
 
-@event.listens_for(Pool, "checkin")
 def receive_checkin(dbapi_conn, connection_record):
     """Log when a connection is returned to the pool."""
     logger.debug("Connection returned to pool")
 
 
+# Only register them when their DEBUG messages would be logged (as configured
+# when this module is imported): they fire on every checkout/checkin, and
+# SQLAlchemy dispatches registered listeners even if nothing is logged
+if logger.isEnabledFor(logging.DEBUG):
+    event.listen(Pool, "connect", receive_connect)
+    event.listen(Pool, "checkout", receive_checkout)
+    event.listen(Pool, "checkin", receive_checkin)
+
+
 # Create session factory
 # autocommit=False: Transactions must be explicitly committed
 # autoflush=False: Don't automatically flush changes (more control)
 # bind=engine: Associate sessions with our engine
+# expire_on_commit=False: Keep loaded attributes after commit instead of
+# re-SELECTing them on next access
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    expire_on_commit=False,
 )
 
 # Base class for all database models
 Base = declarative_base()
 
 
+def _asyncpg_url(database_url: str) -> URL:
+    """Translate the psycopg2 DATABASE_URL for the asyncpg driver."""
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    query = {}
+    for key, value in url.query.items():
+        key = _LIBPQ_TO_ASYNCPG_PARAMS.get(key, key)
+        if key in _ASYNCPG_URL_PARAMS:
+            query[key] = value
+        else:
+            logger.warning(f"Ignoring DATABASE_URL parameter {key!r}, which asyncpg does not support")
+    return url.set(query=query)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the async engine (asyncpg driver) used by FastAPI endpoints.
+
+    Awaiting the database frees the event loop instead of blocking a worker
+    thread per request. The engine has its own pool with the same sizing as
+    the sync engine, and is created on first use, so processes that only use
+    the sync engine (the dashboard, the seed script) never build it.
+    """
+    global _async_engine, _async_session_factory
+    with _async_engine_lock:
+        if _async_engine is None:
+            _async_engine = create_async_engine(
+                _asyncpg_url(settings.database_url),
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_pre_ping=True,
+                echo=settings.db_echo,
+                # Endpoints fall back to the API when the database is down,
+                # so fail fast rather than on asyncpg's 60s default
+                connect_args={"timeout": settings.db_connect_timeout},
+            )
+            # expire_on_commit=False: attributes stay loaded after commit,
+            # since lazy refreshes are not possible outside an awaited call
+            _async_session_factory = async_sessionmaker(
+                _async_engine,
+                expire_on_commit=False,
+            )
+        return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """Return the session factory bound to the async engine."""
+    get_async_engine()
+    return _async_session_factory
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency function that provides a database session.
@@ -86,6 +168,28 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function that provides an async database session.
+
+    Async counterpart of get_db() for `async def` endpoints. The repositories
+    are written against the sync Session API; run them on the async session
+    with run_sync(), which executes them without blocking the event loop.
+
+    Usage in FastAPI:
+        @app.get("/some-endpoint")
+        async def some_endpoint(db: AsyncSession = Depends(get_async_db)):
+            currency_id = await db.run_sync(
+                CryptoCurrencyRepository.get_id_by_symbol_and_market, "BTC", "USD"
+            )
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with get_async_session_factory()() as db:
+        yield db
+
+
 def init_db() -> None:
     """
     Initialize the database by creating all tables.
@@ -123,9 +227,9 @@ def check_db_connection() -> bool:
             print("Database connection failed")
     """
     try:
-        # Try to connect and execute a simple query
+        # Borrow a pooled connection and execute a simple query
         with engine.connect() as connection:
-            connection.execute("SELECT 1")
+            connection.execute(_PING_STMT)
         logger.info("Database connection check successful")
         return True
     except Exception as e:
@@ -1,16 +1,73 @@
 """
 FastAPI main application with routes for cryptocurrency data.
 """
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 from app.services.alphavantage import alphavantage_service
-from app.models.currency import CurrencyDataProcessor, CurrencyResponse
+from app.models.currency import (
+    CurrencyBatchRequest,
+    CurrencyBatchResponse,
+    CurrencyDataProcessor,
+    CurrencyResponse,
+    MONTH_DAYS,
+)
+from app.database.session import get_async_db
+from app.database.repository import CryptoCurrencyRepository, CryptoMetricsRepository
 from app.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Stored daily rollups whose latest bucket is dated more than this before
+# today (UTC) are considered stale, and the endpoints fetch fresh data from
+# AlphaVantage instead
+STORED_DATA_MAX_AGE = timedelta(days=1)
+
+# After a failed stored-data lookup, the endpoints skip the database for this
+# many seconds and go straight to AlphaVantage, instead of waiting for the
+# connect timeout on every request while the database is down
+STORED_DATA_RETRY_DELAY = 30.0
+
+# time.monotonic() before which stored-data lookups are skipped
+_stored_data_retry_at = 0.0
+
+# Daily data changes at most once a day, so clients and CDNs may reuse a
+# currency response for an hour and revalidate it with its ETag afterwards
+CURRENCY_CACHE_CONTROL = "public, max-age=3600"
+
+# (symbol, market) -> (serialized JSON body, ETag). Repeated requests for a
+# pair skip the data lookup, the Pydantic dump and the JSON encoding.
+_currency_payload_cache: TTLCache = TTLCache(
+    maxsize=256, ttl=settings.alphavantage_cache_ttl
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared clients on startup and close them on shutdown."""
+    await alphavantage_service.startup()
+    yield
+    await alphavantage_service.shutdown()
+
+
 app = FastAPI(
     title="Stock Data API",
     description="FastAPI application for fetching and displaying cryptocurrency data from AlphaVantage",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes datetimes and floats natively and much faster than json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
@@ -23,8 +80,136 @@ async def health_check():
     }
 
 
+async def _get_currency_data(
+    db: AsyncSession, symbol: str, market: str
+) -> CurrencyResponse:
+    """
+    Get processed currency data, preferring the database over AlphaVantage.
+
+    Falls back to the API when the database is unreachable or does not hold
+    fresh data for the pair.
+    """
+    if _stored_data_available():
+        try:
+            stored = await db.run_sync(_load_stored_currency_data, symbol, market)
+        except Exception as e:
+            _stored_data_failed(f"Database lookup failed for {symbol}/{market}: {e}")
+            stored = None
+        if stored is not None:
+            return stored
+
+    return await _fetch_currency_data(symbol, market)
+
+
+def _stored_data_available() -> bool:
+    """Check whether stored-data lookups are enabled (no recent failure)."""
+    return time.monotonic() >= _stored_data_retry_at
+
+
+def _stored_data_failed(message: str) -> None:
+    """Log a failed stored-data lookup and skip the database for a while."""
+    global _stored_data_retry_at
+    _stored_data_retry_at = time.monotonic() + STORED_DATA_RETRY_DELAY
+    logger.warning(f"{message}; skipping the database for {STORED_DATA_RETRY_DELAY:.0f}s")
+
+
+async def _fetch_currency_data(symbol: str, market: str) -> CurrencyResponse:
+    """Fetch currency data from AlphaVantage and process it."""
+    raw_data = await alphavantage_service.get_digital_currency_daily(
+        symbol=symbol,
+        market=market
+    )
+    return CurrencyDataProcessor.process_response(raw_data)
+
+
+def _load_stored_currency_data(
+    db: Session, symbol: str, market: str
+) -> Optional[CurrencyResponse]:
+    """
+    Build currency data from the crypto_prices_daily continuous aggregate.
+
+    Returns None unless the API metadata was stored with the prices, a full
+    month of rollups is stored and the latest bucket is dated at most
+    STORED_DATA_MAX_AGE before today (UTC).
+    """
+    currency = CryptoCurrencyRepository.get_by_symbol_and_market(db, symbol, market)
+    if currency is None or currency.api_metadata is None:
+        return None
+
+    rows = CryptoMetricsRepository.get_latest(db, currency.id, days=MONTH_DAYS)
+    if len(rows) < MONTH_DAYS:
+        return None
+    # Buckets start at midnight, so compare dates: yesterday's bucket is
+    # fresh until the end of today
+    latest_day = rows[0][0].astimezone(timezone.utc).date()
+    if latest_day < datetime.now(timezone.utc).date() - STORED_DATA_MAX_AGE:
+        return None
+
+    return CurrencyDataProcessor.process_stored(orjson.loads(currency.api_metadata), rows)
+
+
+def _load_stored_currency_batch(
+    db: Session, symbols: List[str], market: str
+) -> Dict[str, CurrencyResponse]:
+    """Build stored currency data for every symbol that has fresh rollups."""
+    stored = {}
+    for symbol in symbols:
+        data = _load_stored_currency_data(db, symbol, market)
+        if data is not None:
+            stored[symbol] = data
+    return stored
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header (a list of, possibly weak, ETags) against etag."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def clear_currency_payload_cache() -> None:
+    """Drop all cached serialized currency responses."""
+    _currency_payload_cache.clear()
+
+
+async def _get_currency_payload(
+    db: AsyncSession, symbol: str, market: str
+) -> Tuple[bytes, str]:
+    """
+    Get the serialized JSON body and ETag of a currency response.
+
+    Payloads are cached for ALPHAVANTAGE_CACHE_TTL seconds. The ETag is a
+    hash of the body, computed once when the payload is cached.
+    """
+    key = (symbol, market)
+    payload = _currency_payload_cache.get(key)
+    if payload is None:
+        data = await _get_currency_data(db, symbol, market)
+        body = orjson.dumps(data.model_dump())
+        # Not a security use; the flag keeps md5 available on FIPS builds
+        etag = hashlib.md5(body, usedforsecurity=False).hexdigest()
+        payload = (body, f'"{etag}"')
+        _currency_payload_cache[key] = payload
+    return payload
+
+
+def _conditional_json_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Return a pre-serialized JSON body with ETag and Cache-Control headers.
+
+    A request whose If-None-Match holds the current ETag gets an empty
+    304 Not Modified instead of the body.
+    """
+    headers = {"ETag": etag, "Cache-Control": CURRENCY_CACHE_CONTROL}
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/home", response_model=CurrencyResponse)
-async def home():
+async def home(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Home route that displays cryptocurrency data.
     Uses default cryptocurrency (Bitcoin) and market (USD) from configuration.
@@ -37,15 +222,10 @@ async def home():
     """
     try:
         # Fetch data using default settings
-        raw_data = await alphavantage_service.get_digital_currency_daily(
-            symbol=settings.default_symbol,
-            market=settings.default_market
+        body, etag = await _get_currency_payload(
+            db, settings.default_symbol, settings.default_market
         )
-
-        # Process the data
-        processed_data = CurrencyDataProcessor.process_response(raw_data)
-
-        return processed_data
+        return _conditional_json_response(request, body, etag)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -56,8 +236,58 @@ async def home():
         )
 
 
+@app.post("/currency/batch", response_model=CurrencyBatchResponse)
+async def get_currency_batch(
+    request: CurrencyBatchRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get cryptocurrency data for several symbols in one request.
+
+    Symbols with fresh data in the database are served from it; the rest
+    are fetched from AlphaVantage concurrently (still subject to the
+    service's rate limit). A failing symbol does not fail the batch.
+
+    Args:
+        request: Symbols (1-20) and market currency (default: USD)
+
+    Returns:
+        CurrencyBatchResponse: Processed data per symbol, and errors per failed symbol
+    """
+    market = request.market.upper()
+    symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+
+    # The session is not safe for concurrent use, so stored data is loaded
+    # for all symbols in one pass before fanning out to the API
+    results = {}
+    if _stored_data_available():
+        try:
+            results = await db.run_sync(_load_stored_currency_batch, symbols, market)
+        except Exception as e:
+            _stored_data_failed(f"Database lookup failed for batch {symbols}/{market}: {e}")
+
+    missing = [symbol for symbol in symbols if symbol not in results]
+    fetched = await asyncio.gather(
+        *(_fetch_currency_data(symbol, market) for symbol in missing),
+        return_exceptions=True,
+    )
+
+    errors = {}
+    for symbol, result in zip(missing, fetched):
+        if isinstance(result, Exception):
+            errors[symbol] = str(result)
+        else:
+            results[symbol] = result
+
+    return CurrencyBatchResponse(results=results, errors=errors)
+
+
 @app.get("/currency/{symbol}", response_model=CurrencyResponse)
-async def get_currency(symbol: str, market: str = "USD"):
+async def get_currency(
+    request: Request,
+    symbol: str,
+    market: str = "USD",
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Get cryptocurrency data for a specific symbol.
 
@@ -73,15 +303,8 @@ async def get_currency(symbol: str, market: str = "USD"):
     """
     try:
         # Fetch data for specified currency
-        raw_data = await alphavantage_service.get_digital_currency_daily(
-            symbol=symbol.upper(),
-            market=market.upper()
-        )
-
-        # Process the data
-        processed_data = CurrencyDataProcessor.process_response(raw_data)
-
-        return processed_data
+        body, etag = await _get_currency_payload(db, symbol.upper(), market.upper())
+        return _conditional_json_response(request, body, etag)
 
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -106,6 +329,7 @@ async def root():
             "/health": "Check API health status",
             "/home": "Get default cryptocurrency data (Bitcoin)",
             "/currency/{symbol}": "Get specific cryptocurrency data",
+            "/currency/batch": "Get data for several cryptocurrencies (POST)",
             "/docs": "Interactive API documentation"
         }
     }
@@ -1,13 +1,25 @@
 """
 Data models and processors for cryptocurrency information.
 """
-from typing import Dict, List, Optional
+import heapq
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel
+from itertools import islice
+from operator import itemgetter
+
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+
+
+# Response models are built once by trusted code and never mutated, so they
+# are frozen and unknown keys are dropped
+_RESPONSE_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore")
 
 
 class TimeSeriesData(BaseModel):
     """Individual time series data point."""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     date: str
     open: float
     high: float
@@ -18,6 +30,8 @@ class TimeSeriesData(BaseModel):
 
 class CurrencyMetadata(BaseModel):
     """Metadata about the cryptocurrency."""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     information: str
     digital_currency_code: str
     digital_currency_name: str
@@ -29,6 +43,8 @@ class CurrencyMetadata(BaseModel):
 
 class CalculatedMetrics(BaseModel):
     """Calculated metrics from the time series data."""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     latest_price: float
     latest_volume: float
     latest_date: str
@@ -44,10 +60,78 @@ class CalculatedMetrics(BaseModel):
 
 class CurrencyResponse(BaseModel):
     """Formatted response for currency data."""
+    model_config = _RESPONSE_MODEL_CONFIG
+
     metadata: CurrencyMetadata
     metrics: CalculatedMetrics
     recent_data: List[TimeSeriesData]
 
+    # Column-oriented copy of recent_data for Python-side consumers (charts).
+    # Private attributes stay out of the API schema and JSON output.
+    _recent_dates: Optional[np.ndarray] = PrivateAttr(default=None)
+    _recent_ohlcv: Optional[np.ndarray] = PrivateAttr(default=None)
+
+    def recent_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return recent dates and their (N, 5) OHLCV array, oldest first."""
+        if self._recent_ohlcv is None:
+            rows = self.recent_data[::-1]
+            self._recent_dates = np.array([d.date for d in rows], dtype=object)
+            self._recent_ohlcv = np.array(
+                [(d.open, d.high, d.low, d.close, d.volume) for d in rows],
+                dtype=np.float64,
+            ).reshape(-1, 5)
+        return self._recent_dates, self._recent_ohlcv
+
+
+class CurrencyBatchRequest(BaseModel):
+    """Request body for fetching several cryptocurrencies at once."""
+    symbols: List[str] = Field(..., min_length=1, max_length=20)
+    market: str = "USD"
+
+
+class CurrencyBatchResponse(BaseModel):
+    """Per-symbol results of a batch request; failed symbols map to an error."""
+    model_config = _RESPONSE_MODEL_CONFIG
+
+    results: Dict[str, CurrencyResponse]
+    errors: Dict[str, str]
+
+
+# Key of the daily series in AlphaVantage's DIGITAL_CURRENCY_DAILY response
+TIME_SERIES_KEY = "Time Series (Digital Currency Daily)"
+
+# Column order of the OHLCV arrays built by CurrencyDataProcessor
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+_OHLCV_KEYS = ("1. open", "2. high", "3. low", "4. close", "5. volume")
+_get_ohlcv = itemgetter(*_OHLCV_KEYS)
+
+# Trailing windows (in days) reported by calculate_metrics
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+
+
+def _window_stats(ohlcv: np.ndarray, windows: Tuple[int, ...]) -> List[Tuple[float, float, float]]:
+    """
+    Return (avg close, max high, min low) for each leading window of rows.
+
+    The windows are nested (the week is a prefix of the month), so a single
+    running sum/max/min over the longest window answers all of them.
+    """
+    head = ohlcv[:max(windows)]
+    close_sum = np.cumsum(head[:, CLOSE])
+    running_high = np.maximum.accumulate(head[:, HIGH])
+    running_low = np.minimum.accumulate(head[:, LOW])
+
+    stats = []
+    for window in windows:
+        last = min(window, len(head)) - 1
+        stats.append((
+            float(close_sum[last]) / (last + 1),
+            float(running_high[last]),
+            float(running_low[last]),
+        ))
+    return stats
+
 
 class CurrencyDataProcessor:
     """Process and calculate metrics from raw AlphaVantage data."""
@@ -66,9 +150,11 @@ class CurrencyDataProcessor:
         )
 
     @staticmethod
-    def parse_time_series(raw_time_series: Dict, market_code: str = "USD") -> List[TimeSeriesData]:
+    def parse_time_series_arrays(
+        raw_time_series: Dict, limit: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Parse time series data from API response.
+        Parse time series data into a dates array and an (N, 5) OHLCV array.
 
         AlphaVantage returns data with simple numbered keys:
         - "1. open": Opening price in market currency (USD)
@@ -76,53 +162,92 @@ class CurrencyDataProcessor:
         - "3. low": Lowest price of the day
         - "4. close": Closing price (most important for calculations)
         - "5. volume": Trading volume in cryptocurrency units
+
+        Both arrays are sorted by date descending (most recent first); OHLCV
+        columns are indexed by OPEN, HIGH, LOW, CLOSE and VOLUME.
+
+        Args:
+            raw_time_series: Mapping of ISO date -> AlphaVantage daily fields
+            limit: Only parse the `limit` most recent days
         """
-        series_data = []
-        for date_str, values in raw_time_series.items():
-            series_data.append(TimeSeriesData(
-                date=date_str,
-                open=float(values.get("1. open", 0)),
-                high=float(values.get("2. high", 0)),
-                low=float(values.get("3. low", 0)),
-                close=float(values.get("4. close", 0)),
-                volume=float(values.get("5. volume", 0))
-            ))
-        # Sort by date descending (most recent first)
-        series_data.sort(key=lambda x: x.date, reverse=True)
-        return series_data
+        # ISO dates sort lexicographically. AlphaVantage already returns them
+        # newest first, in which case no sort is needed at all.
+        dates_list = list(raw_time_series)
+        newest_first = all(a > b for a, b in zip(dates_list, islice(dates_list, 1, None)))
+
+        rows = raw_time_series.items()
+        if limit is not None and len(dates_list) > limit:
+            if newest_first:
+                rows = islice(rows, limit)
+            else:
+                rows = heapq.nlargest(limit, rows, key=itemgetter(0))
+                newest_first = True
+        rows = list(rows)
+
+        dates = np.array([date for date, _ in rows], dtype=object)
+
+        # Collect the raw string fields and let NumPy convert them to float64
+        # in one C-level pass instead of calling float() per field
+        try:
+            fields = [_get_ohlcv(values) for _, values in rows]
+        except KeyError:
+            # Missing fields default to 0
+            fields = [
+                [values.get(key, 0) for key in _OHLCV_KEYS]
+                for _, values in rows
+            ]
+        ohlcv = np.array(fields, dtype=np.float64).reshape(-1, 5)
+
+        if newest_first:
+            return dates, ohlcv
+        order = np.argsort(dates.astype(str), kind="stable")[::-1]
+        return dates[order], ohlcv[order]
 
     @staticmethod
-    def calculate_metrics(time_series: List[TimeSeriesData]) -> CalculatedMetrics:
-        """Calculate relevant metrics from time series data."""
-        if not time_series:
+    def to_time_series(dates: np.ndarray, ohlcv: np.ndarray) -> List[TimeSeriesData]:
+        """
+        Build TimeSeriesData rows from parsed arrays.
+
+        The arrays are already typed (str dates, float64 values), so rows are
+        built with model_construct and skip Pydantic validation entirely.
+        """
+        construct = TimeSeriesData.model_construct
+        return [
+            construct(date=date, open=o, high=h, low=l, close=c, volume=v)
+            for date, (o, h, l, c, v) in zip(dates.tolist(), ohlcv.tolist())
+        ]
+
+    @classmethod
+    def parse_time_series(cls, raw_time_series: Dict, market_code: str = "USD") -> List[TimeSeriesData]:
+        """Parse time series data from API response, most recent first."""
+        dates, ohlcv = cls.parse_time_series_arrays(raw_time_series)
+        return cls.to_time_series(dates, ohlcv)
+
+    @staticmethod
+    def calculate_metrics_from_arrays(dates: np.ndarray, ohlcv: np.ndarray) -> CalculatedMetrics:
+        """Calculate relevant metrics from parsed (most recent first) arrays."""
+        if len(ohlcv) == 0:
             raise ValueError("No time series data available")
 
-        latest = time_series[0]
+        latest_close = float(ohlcv[0, CLOSE])
 
         # Daily change (if we have at least 2 days)
         daily_change = None
         daily_change_percent = None
-        if len(time_series) > 1:
-            previous = time_series[1]
-            daily_change = latest.close - previous.close
-            daily_change_percent = (daily_change / previous.close) * 100 if previous.close else None
-
-        # Weekly metrics (last 7 days)
-        weekly_data = time_series[:7]
-        weekly_avg = sum(d.close for d in weekly_data) / len(weekly_data) if weekly_data else None
-        weekly_high = max(d.high for d in weekly_data) if weekly_data else None
-        weekly_low = min(d.low for d in weekly_data) if weekly_data else None
-
-        # Monthly metrics (last 30 days)
-        monthly_data = time_series[:30]
-        monthly_avg = sum(d.close for d in monthly_data) / len(monthly_data) if monthly_data else None
-        monthly_high = max(d.high for d in monthly_data) if monthly_data else None
-        monthly_low = min(d.low for d in monthly_data) if monthly_data else None
+        if len(ohlcv) > 1:
+            previous_close = float(ohlcv[1, CLOSE])
+            daily_change = latest_close - previous_close
+            daily_change_percent = (daily_change / previous_close) * 100 if previous_close else None
+
+        # Weekly (last 7 days) and monthly (last 30 days) metrics
+        (weekly_avg, weekly_high, weekly_low), (monthly_avg, monthly_high, monthly_low) = (
+            _window_stats(ohlcv, (WEEK_DAYS, MONTH_DAYS))
+        )
 
         return CalculatedMetrics(
-            latest_price=latest.close,
-            latest_volume=latest.volume,
-            latest_date=latest.date,
+            latest_price=latest_close,
+            latest_volume=float(ohlcv[0, VOLUME]),
+            latest_date=dates[0],
             daily_change=round(daily_change, 2) if daily_change else None,
             daily_change_percent=round(daily_change_percent, 2) if daily_change_percent else None,
             weekly_avg=round(weekly_avg, 2) if weekly_avg else None,
@@ -133,6 +258,63 @@ class CurrencyDataProcessor:
             monthly_low=round(monthly_low, 2) if monthly_low else None
         )
 
+    @classmethod
+    def calculate_metrics(cls, time_series: List[TimeSeriesData]) -> CalculatedMetrics:
+        """Calculate relevant metrics from time series data."""
+        if not time_series:
+            raise ValueError("No time series data available")
+
+        dates = np.array([d.date for d in time_series], dtype=object)
+        ohlcv = np.array(
+            [(d.open, d.high, d.low, d.close, d.volume) for d in time_series],
+            dtype=np.float64,
+        )
+        return cls.calculate_metrics_from_arrays(dates, ohlcv)
+
+    @classmethod
+    def build_response(
+        cls,
+        metadata: CurrencyMetadata,
+        metrics: CalculatedMetrics,
+        dates: np.ndarray,
+        ohlcv: np.ndarray,
+    ) -> CurrencyResponse:
+        """Assemble a response holding the 10 most recent days of data."""
+        # Return only last 10 days of data for brevity; only these rows
+        # are materialized as Pydantic models
+        recent_dates = dates[:10]
+        recent_ohlcv = ohlcv[:10]
+        response = CurrencyResponse(
+            metadata=metadata,
+            metrics=metrics,
+            recent_data=cls.to_time_series(recent_dates, recent_ohlcv)
+        )
+        # Keep the columns too (oldest first) so charts skip row-by-row access
+        response._recent_dates = recent_dates[::-1]
+        response._recent_ohlcv = recent_ohlcv[::-1]
+        return response
+
+    @classmethod
+    def process_stored(cls, raw_metadata: Dict, rows: List[Tuple]) -> CurrencyResponse:
+        """
+        Build a response from stored daily rollups instead of an API payload.
+
+        Args:
+            raw_metadata: The API's "Meta Data" object, stored with the prices
+            rows: (bucket, open, high, low, close, volume) rows, most recent first
+
+        Returns:
+            CurrencyResponse equal to what process_response builds from an
+            API payload holding the same days
+        """
+        dates = np.array([row[0].date().isoformat() for row in rows], dtype=object)
+        ohlcv = np.array([row[1:] for row in rows], dtype=np.float64).reshape(-1, 5)
+
+        metadata = cls.parse_metadata(raw_metadata)
+        metrics = cls.calculate_metrics_from_arrays(dates, ohlcv)
+
+        return cls.build_response(metadata, metrics, dates, ohlcv)
+
     @classmethod
     def process_response(cls, raw_data: Dict) -> CurrencyResponse:
         """
@@ -146,17 +328,10 @@ class CurrencyDataProcessor:
         """
         metadata = cls.parse_metadata(raw_data.get("Meta Data", {}))
 
-        time_series_key = "Time Series (Digital Currency Daily)"
-        raw_time_series = raw_data.get(time_series_key, {})
+        raw_time_series = raw_data.get(TIME_SERIES_KEY, {})
 
-        time_series = cls.parse_time_series(raw_time_series, metadata.market_code)
-        metrics = cls.calculate_metrics(time_series)
+        # Metrics look back at most MONTH_DAYS, so older days are never parsed
+        dates, ohlcv = cls.parse_time_series_arrays(raw_time_series, limit=MONTH_DAYS)
+        metrics = cls.calculate_metrics_from_arrays(dates, ohlcv)
 
-        # Return only last 10 days of data for brevity
-        recent_data = time_series[:10]
-
-        return CurrencyResponse(
-            metadata=metadata,
-            metrics=metrics,
-            recent_data=recent_data
-        )
+        return cls.build_response(metadata, metrics, dates, ohlcv)
@@ -1,7 +1,12 @@
 """
 AlphaVantage API service for fetching cryptocurrency data.
 """
+import asyncio
+import threading
 import httpx
+import orjson
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
 from typing import Dict, Optional
 from app.config import settings
 
@@ -13,12 +18,89 @@ class AlphaVantageService:
         self.base_url = settings.alphavantage_base_url
         self.api_key = settings.alphavantage_api_key
 
+        # Token bucket shared by every caller: AlphaVantage enforces its
+        # quota per API key, so concurrent callers must draw from one budget
+        self._rate_limiter = AsyncLimiter(settings.alphavantage_requests_per_minute, 60)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # (symbol, market) -> decoded response. Only successful responses are
+        # stored, so rate-limit notes and errors are retried on the next call.
+        # The lock covers callers on different threads (Streamlit sessions).
+        self._response_cache: TTLCache = TTLCache(
+            maxsize=128, ttl=settings.alphavantage_cache_ttl
+        )
+        self._response_cache_lock = threading.Lock()
+
+    def _bind_loop(self) -> None:
+        """
+        Create the semaphore and pooled HTTP client for the running event loop.
+
+        Both are bound to one loop. The FastAPI app and the Streamlit dashboard
+        each run requests on a single long-lived loop, where the client keeps
+        connections alive so repeated calls skip the TCP/TLS handshake. When a
+        caller moves to another loop (e.g. successive asyncio.run() calls), the
+        previous client is released first.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._client is not None and not self._client.is_closed:
+            return
+
+        self._release_client()
+        self._semaphore = asyncio.Semaphore(settings.alphavantage_max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+        self._loop = loop
+
+    def _release_client(self) -> None:
+        """
+        Close the client bound to a previous event loop.
+
+        A client's connections can only be closed on the loop that opened
+        them. If that loop is still running (on another thread) the close is
+        scheduled there; otherwise the client is dropped and its sockets are
+        freed on garbage collection, so callers that end their loop should
+        await shutdown() first.
+        """
+        client, loop = self._client, self._loop
+        self._client = None
+        if client is None or client.is_closed:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def startup(self) -> None:
+        """Open the shared HTTP client (called from the FastAPI lifespan)."""
+        self._bind_loop()
+
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client."""
+        if self._loop is asyncio.get_running_loop():
+            if self._client is not None:
+                await self._client.aclose()
+            self._client = None
+        else:
+            self._release_client()
+        self._semaphore = None
+        self._loop = None
+
+    def clear_cache(self) -> None:
+        """Drop all cached API responses."""
+        with self._response_cache_lock:
+            self._response_cache.clear()
+
     async def get_digital_currency_daily(
         self, symbol: str, market: str = "USD"
     ) -> Dict:
         """
         Fetch daily digital currency data from AlphaVantage.
 
+        Responses are cached in-process for ALPHAVANTAGE_CACHE_TTL seconds;
+        the returned dict is shared between callers and must not be mutated.
+
         Args:
             symbol: Cryptocurrency symbol (e.g., 'BTC', 'ETH')
             market: Market currency (default: 'USD')
@@ -37,20 +119,34 @@ class AlphaVantageService:
             "apikey": self.api_key,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(self.base_url, params=params)
-            response.raise_for_status()
+        cache_key = (symbol, market)
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        self._bind_loop()
+
+        # Wait for a concurrency slot and a rate-limit token before calling out
+        async with self._semaphore, self._rate_limiter:
+            response = await self._client.get(self.base_url, params=params)
+
+        response.raise_for_status()
 
-            data = response.json()
+        # orjson decodes the ~1000-day payload several times faster than
+        # the stdlib json used by response.json()
+        data = orjson.loads(response.content)
 
-            # Check for API error messages
-            if "Error Message" in data:
-                raise ValueError(f"API Error: {data['Error Message']}")
+        # Check for API error messages
+        if "Error Message" in data:
+            raise ValueError(f"API Error: {data['Error Message']}")
 
-            if "Note" in data:
-                raise ValueError(f"API Rate Limit: {data['Note']}")
+        if "Note" in data:
+            raise ValueError(f"API Rate Limit: {data['Note']}")
 
-            return data
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = data
+        return data
 
 
 # Global service instance
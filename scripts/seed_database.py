@@ -7,6 +7,8 @@ import asyncio
 from pathlib import Path
 from datetime import datetime
 
+import orjson
+
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
@@ -14,10 +16,17 @@ from app.config import settings
 from app.database.session import SessionLocal
 from app.database.repository import (
     CryptoCurrencyRepository,
+    CryptoMetricsRepository,
     CryptoPriceRepository,
 )
 from app.services.alphavantage import alphavantage_service
-from app.models.currency import CurrencyDataProcessor
+from app.models.currency import CurrencyDataProcessor, TIME_SERIES_KEY
+
+try:
+    # libuv-based event loop, installed with uvicorn[standard] (not on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
 
 
 # Cryptocurrencies to seed
@@ -52,26 +61,31 @@ async def fetch_and_store_crypto_data(
         raw_data = await alphavantage_service.get_digital_currency_daily(
             symbol, market
         )
-        processed_data = CurrencyDataProcessor.process_response(raw_data)
-
-        # Prepare price records for bulk insert
-        price_records = []
-        for data_point in processed_data.recent_data:
-            price_records.append(
-                {
-                    "currency_id": currency.id,
-                    "timestamp": datetime.fromisoformat(data_point.date),
-                    "open": data_point.open,
-                    "high": data_point.high,
-                    "low": data_point.low,
-                    "close": data_point.close,
-                    "volume": data_point.volume,
-                }
-            )
-
-        # Bulk insert price data
+        # Stored responses reuse the API's metadata (market name, refresh time)
+        CryptoCurrencyRepository.update(
+            db, currency.id, api_metadata=orjson.dumps(raw_data.get("Meta Data", {})).decode()
+        )
+        dates, ohlcv = CurrencyDataProcessor.parse_time_series_arrays(
+            raw_data.get(TIME_SERIES_KEY, {})
+        )
+
+        # Prepare price records for the full daily history
+        price_records = [
+            {
+                "currency_id": currency.id,
+                "timestamp": datetime.fromisoformat(date),
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            }
+            for date, (open_, high, low, close, volume) in zip(dates.tolist(), ohlcv.tolist())
+        ]
+
+        # Stream price data with binary COPY (existing days are skipped)
         if price_records:
-            count = CryptoPriceRepository.bulk_create(db, price_records)
+            count = CryptoPriceRepository.bulk_copy(db, price_records)
             print(f"  ✓ Inserted {count} price records")
             return True
         else:
@@ -79,6 +93,9 @@ async def fetch_and_store_crypto_data(
             return False
 
     except Exception as e:
+        # The session is shared by all concurrent fetches; don't leave it
+        # in a failed transaction for the others
+        db.rollback()
         print(f"  ✗ Error processing {symbol}: {str(e)}")
         return False
 
@@ -91,6 +108,7 @@ async def seed_database():
     print(f"Database: {settings.postgres_db}")
     print(f"Market: {DEFAULT_MARKET}")
     print(f"Cryptocurrencies to seed: {len(CRYPTOCURRENCIES)}")
+    print(f"Rate limit: {settings.alphavantage_requests_per_minute} requests/minute")
     print("=" * 60)
     print()
 
@@ -98,26 +116,25 @@ async def seed_database():
     db = SessionLocal()
 
     try:
-        success_count = 0
-        fail_count = 0
-
-        for symbol, name in CRYPTOCURRENCIES.items():
-            success = await fetch_and_store_crypto_data(
-                db, symbol, name, DEFAULT_MARKET
-            )
-
-            if success:
-                success_count += 1
-            else:
-                fail_count += 1
-
-            # Add delay to respect API rate limits (5 requests/minute)
-            if symbol != list(CRYPTOCURRENCIES.keys())[-1]:  # Not the last one
-                print(f"  ⏳ Waiting 15 seconds (API rate limit)...")
-                await asyncio.sleep(15)
-
+        # Fetch all currencies concurrently. The AlphaVantage service
+        # throttles requests to the configured quota, so no manual delays
+        # are needed; database work runs between awaits and never overlaps.
+        results = await asyncio.gather(*(
+            fetch_and_store_crypto_data(db, symbol, name, DEFAULT_MARKET)
+            for symbol, name in CRYPTOCURRENCIES.items()
+        ))
+        success_count = sum(results)
+        fail_count = len(results) - success_count
+
+        # The aggregate's refresh policy only covers recent days, so the
+        # seeded history is materialized once here
+        if success_count:
             print()
+            print("Refreshing daily rollups...")
+            CryptoMetricsRepository.refresh_daily(db)
+            print("  ✓ crypto_prices_daily materialized")
 
+        print()
         print("=" * 60)
         print("SEEDING COMPLETE")
         print(f"✓ Success: {success_count}/{len(CRYPTOCURRENCIES)}")
@@ -129,13 +146,17 @@ async def seed_database():
         raise
     finally:
         db.close()
+        # Close pooled connections before asyncio.run() closes the loop
+        await alphavantage_service.shutdown()
 
 
 if __name__ == "__main__":
     print("Starting database seeding...")
     print()
 
-    # Run the async seeding function
+    # Run the async seeding function (on uvloop when available)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(seed_database())
 
     print()
@@ -2,25 +2,142 @@
 Test suite for the FastAPI application.
 Demonstrates Test-First mentality with basic test examples.
 """
+import asyncio
+import struct
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
-from app.main import app
-from app.models.currency import CurrencyResponse, CurrencyMetadata, CalculatedMetrics, TimeSeriesData
-
-
-client = TestClient(app)
+from app.models.currency import (
+    CurrencyResponse,
+    CurrencyMetadata,
+    CalculatedMetrics,
+    TimeSeriesData,
+    MONTH_DAYS,
+    TIME_SERIES_KEY,
+)
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Test client for the FastAPI app, built on first use rather than at import."""
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def client(app_client):
+    """
+    Shared test client; every test starts without cached currency responses.
+
+    Stored-data lookups are patched to find nothing, so endpoints never reach
+    a real database (tests that need stored data patch them again).
+    """
+    from app.main import clear_currency_payload_cache
+    from app.services.alphavantage import alphavantage_service
+    clear_currency_payload_cache()
+    alphavantage_service.clear_cache()
+    with patch('app.main._load_stored_currency_data', return_value=None), \
+            patch('app.main._load_stored_currency_batch', return_value={}), \
+            patch('app.main._stored_data_retry_at', 0.0):
+        yield app_client
+
+
+@pytest.fixture(scope="module")
+def mock_api_response():
+    """Fixture providing a mock API response."""
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Prices and Volumes for Digital Currency",
+            "2. Digital Currency Code": "BTC",
+            "3. Digital Currency Name": "Bitcoin",
+            "4. Market Code": "USD",
+            "5. Market Name": "United States Dollar",
+            "6. Last Refreshed": "2024-01-15",
+            "7. Time Zone": "UTC"
+        },
+        "Time Series (Digital Currency Daily)": {
+            "2024-01-15": {
+                "1a. open (USD)": "42000.00",
+                "2a. high (USD)": "43000.00",
+                "3a. low (USD)": "41500.00",
+                "4a. close (USD)": "42500.00",
+                "5. volume": "1000000.00"
+            },
+            "2024-01-14": {
+                "1a. open (USD)": "41000.00",
+                "2a. high (USD)": "42000.00",
+                "3a. low (USD)": "40500.00",
+                "4a. close (USD)": "41800.00",
+                "5. volume": "950000.00"
+            }
+        }
+    }
+
+
+@pytest.fixture(scope="module")
+def daily_api_response():
+    """
+    Fixture providing an API response with AlphaVantage's real field names.
+
+    40 days, newest first, ending 2024-02-20; each day's close is 10 below
+    the next day's, starting from 67234.56.
+    """
+    time_series = {}
+    for age in range(40):
+        close = 67234.56 - 10 * age
+        time_series[(date(2024, 2, 20) - timedelta(days=age)).isoformat()] = {
+            "1. open": f"{close - 1:.2f}",
+            "2. high": f"{close + 2:.2f}",
+            "3. low": f"{close - 3:.2f}",
+            "4. close": f"{close:.2f}",
+            "5. volume": f"{1000 + age:.2f}",
+        }
+    return {
+        "Meta Data": {
+            "1. Information": "Daily Prices and Volumes for Digital Currency",
+            "2. Digital Currency Code": "BTC",
+            "3. Digital Currency Name": "Bitcoin",
+            "4. Market Code": "USD",
+            "5. Market Name": "United States Dollar",
+            "6. Last Refreshed": "2024-02-20 00:00:00",
+            "7. Time Zone": "UTC"
+        },
+        TIME_SERIES_KEY: time_series,
+    }
+
+
+@pytest.fixture
+def alphavantage():
+    """The AlphaVantage service, with its response cache empty before and after the test."""
+    from app.services.alphavantage import alphavantage_service
+    alphavantage_service.clear_cache()
+    yield alphavantage_service
+    alphavantage_service.clear_cache()
+
+
+@pytest.fixture
+def patched_service(mock_api_response):
+    """Patch the AlphaVantage call to return mock_api_response by default."""
+    with patch(
+        'app.services.alphavantage.alphavantage_service.get_digital_currency_daily',
+        return_value=mock_api_response,
+    ) as mock_get_data:
+        yield mock_get_data
 
 
 class TestHealthEndpoint:
     """Tests for the /health endpoint."""
 
-    def test_health_check_returns_200(self):
+    def test_health_check_returns_200(self, client):
         """Test that health check endpoint returns 200 status code."""
         response = client.get("/health")
         assert response.status_code == 200
 
-    def test_health_check_returns_correct_structure(self):
+    def test_health_check_returns_correct_structure(self, client):
         """Test that health check returns expected JSON structure."""
         response = client.get("/health")
         data = response.json()
@@ -34,12 +151,12 @@ class TestHealthEndpoint:
 class TestRootEndpoint:
     """Tests for the root / endpoint."""
 
-    def test_root_returns_200(self):
+    def test_root_returns_200(self, client):
         """Test that root endpoint returns 200 status code."""
         response = client.get("/")
         assert response.status_code == 200
 
-    def test_root_returns_welcome_message(self):
+    def test_root_returns_welcome_message(self, client):
         """Test that root endpoint returns welcome message and endpoints info."""
         response = client.get("/")
         data = response.json()
@@ -53,51 +170,13 @@ class TestRootEndpoint:
 class TestHomeEndpoint:
     """Tests for the /home endpoint."""
 
-    @pytest.fixture
-    def mock_api_response(self):
-        """Fixture providing a mock API response."""
-        return {
-            "Meta Data": {
-                "1. Information": "Daily Prices and Volumes for Digital Currency",
-                "2. Digital Currency Code": "BTC",
-                "3. Digital Currency Name": "Bitcoin",
-                "4. Market Code": "USD",
-                "5. Market Name": "United States Dollar",
-                "6. Last Refreshed": "2024-01-15",
-                "7. Time Zone": "UTC"
-            },
-            "Time Series (Digital Currency Daily)": {
-                "2024-01-15": {
-                    "1a. open (USD)": "42000.00",
-                    "2a. high (USD)": "43000.00",
-                    "3a. low (USD)": "41500.00",
-                    "4a. close (USD)": "42500.00",
-                    "5. volume": "1000000.00"
-                },
-                "2024-01-14": {
-                    "1a. open (USD)": "41000.00",
-                    "2a. high (USD)": "42000.00",
-                    "3a. low (USD)": "40500.00",
-                    "4a. close (USD)": "41800.00",
-                    "5. volume": "950000.00"
-                }
-            }
-        }
-
-    @patch('app.services.alphavantage.alphavantage_service.get_digital_currency_daily')
-    def test_home_endpoint_returns_200_with_valid_data(self, mock_get_data, mock_api_response):
+    def test_home_endpoint_returns_200_with_valid_data(self, patched_service, client):
         """Test that /home endpoint returns 200 with processed data."""
-        # Mock the async method
-        mock_get_data.return_value = mock_api_response
-
         response = client.get("/home")
         assert response.status_code == 200
 
-    @patch('app.services.alphavantage.alphavantage_service.get_digital_currency_daily')
-    def test_home_endpoint_returns_currency_response_structure(self, mock_get_data, mock_api_response):
+    def test_home_endpoint_returns_currency_response_structure(self, patched_service, client):
         """Test that /home endpoint returns correct response structure."""
-        mock_get_data.return_value = mock_api_response
-
         response = client.get("/home")
         data = response.json()
 
@@ -114,10 +193,22 @@ class TestHomeEndpoint:
         assert "latest_price" in data["metrics"]
         assert "latest_volume" in data["metrics"]
 
-    @patch('app.services.alphavantage.alphavantage_service.get_digital_currency_daily')
-    def test_home_endpoint_handles_api_errors(self, mock_get_data):
+    def test_home_endpoint_returns_304_for_matching_etag(self, patched_service, client):
+        """Test that /home honours If-None-Match with the ETag it returned."""
+        response = client.get("/home")
+        etag = response.headers["ETag"]
+        assert "max-age" in response.headers["Cache-Control"]
+
+        cached = client.get("/home", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        assert cached.content == b""
+
+        # The second request was answered from the serialized payload cache
+        patched_service.assert_called_once()
+
+    def test_home_endpoint_handles_api_errors(self, patched_service, client):
         """Test that /home endpoint handles API errors gracefully."""
-        mock_get_data.side_effect = ValueError("API Error: Invalid symbol")
+        patched_service.side_effect = ValueError("API Error: Invalid symbol")
 
         response = client.get("/home")
         assert response.status_code == 400
@@ -127,10 +218,9 @@ class TestHomeEndpoint:
 class TestCurrencyEndpoint:
     """Tests for the /currency/{symbol} endpoint."""
 
-    @patch('app.services.alphavantage.alphavantage_service.get_digital_currency_daily')
-    def test_currency_endpoint_accepts_symbol_parameter(self, mock_get_data):
+    def test_currency_endpoint_accepts_symbol_parameter(self, patched_service, client):
         """Test that /currency endpoint accepts symbol parameter."""
-        mock_get_data.return_value = {
+        patched_service.return_value = {
             "Meta Data": {
                 "1. Information": "Daily Prices",
                 "2. Digital Currency Code": "ETH",
@@ -155,10 +245,111 @@ class TestCurrencyEndpoint:
         assert response.status_code == 200
 
         # Verify the service was called with uppercase symbol
-        mock_get_data.assert_called_once()
-        args = mock_get_data.call_args[1]
+        patched_service.assert_called_once()
+        args = patched_service.call_args[1]
         assert args["symbol"] == "ETH"
 
+    @patch('app.main._load_stored_currency_data')
+    def test_currency_endpoint_serves_stored_data_without_api_call(self, mock_load_stored, patched_service, client):
+        """Test that fresh data in the database is served without calling the API."""
+        mock_load_stored.return_value = CurrencyResponse(
+            metadata=CurrencyMetadata(
+                information="Daily Prices and Volumes for Digital Currency",
+                digital_currency_code="BTC",
+                digital_currency_name="Bitcoin",
+                market_code="USD",
+                market_name="USD",
+                last_refreshed="2024-01-15",
+                time_zone="UTC"
+            ),
+            metrics=CalculatedMetrics(latest_price=42500, latest_volume=1000000, latest_date="2024-01-15"),
+            recent_data=[
+                TimeSeriesData(date="2024-01-15", open=42000, high=43000, low=41500, close=42500, volume=1000000)
+            ]
+        )
+
+        response = client.get("/currency/btc")
+        assert response.status_code == 200
+        assert response.json()["metrics"]["latest_price"] == 42500
+
+        patched_service.assert_not_called()
+        assert mock_load_stored.call_args[0][1:] == ("BTC", "USD")
+
+    def test_currency_endpoint_skips_database_after_a_failed_lookup(self, patched_service, client):
+        """Test that a failing database is not queried again on the next request."""
+        with patch('app.main._load_stored_currency_data', side_effect=OSError("connection refused")) as mock_load_stored:
+            assert client.get("/currency/BTC").status_code == 200
+            assert client.get("/currency/ETH").status_code == 200
+
+        # Both requests were served by the API, but only the first tried the database
+        assert mock_load_stored.call_count == 1
+        assert patched_service.call_count == 2
+
+
+class TestCurrencyBatchEndpoint:
+    """Tests for the /currency/batch endpoint."""
+
+    def test_batch_endpoint_returns_results_and_errors_per_symbol(self, patched_service, client):
+        """Test that a failing symbol is reported without failing the batch."""
+        async def fake_get_data(symbol, market):
+            if symbol == "XXX":
+                raise ValueError("API Error: Invalid symbol")
+            return {
+                "Meta Data": {"2. Digital Currency Code": symbol, "4. Market Code": market},
+                "Time Series (Digital Currency Daily)": {
+                    "2024-01-15": {
+                        "1. open": "100.00",
+                        "2. high": "110.00",
+                        "3. low": "90.00",
+                        "4. close": "105.00",
+                        "5. volume": "1000.00"
+                    }
+                }
+            }
+
+        patched_service.side_effect = fake_get_data
+
+        response = client.post("/currency/batch", json={"symbols": ["btc", "eth", "xxx", "BTC"]})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert set(data["results"]) == {"BTC", "ETH"}
+        assert data["results"]["ETH"]["metrics"]["latest_price"] == 105
+        assert "API Error" in data["errors"]["XXX"]
+        assert patched_service.call_count == 3  # Duplicate symbols are fetched once
+
+    def test_batch_endpoint_rejects_empty_symbol_list(self, client):
+        """Test that a batch request needs at least one symbol."""
+        response = client.post("/currency/batch", json={"symbols": []})
+        assert response.status_code == 422
+
+
+class TestAlphaVantageService:
+    """Tests for the AlphaVantage service."""
+
+    def test_second_fetch_within_ttl_is_served_from_cache(self, alphavantage, mock_api_response):
+        """Test that a repeated request within the cache TTL skips the HTTP call."""
+        response = httpx.Response(
+            200,
+            content=orjson.dumps(mock_api_response),
+            request=httpx.Request("GET", alphavantage.base_url),
+        )
+
+        async def fetch_twice():
+            try:
+                first = await alphavantage.get_digital_currency_daily("BTC", "USD")
+                second = await alphavantage.get_digital_currency_daily("BTC", "USD")
+            finally:
+                await alphavantage.shutdown()
+            return first, second
+
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock, return_value=response) as mock_get:
+            first, second = asyncio.run(fetch_twice())
+
+        mock_get.assert_called_once()
+        assert first == mock_api_response
+        assert second is first
+
 
 class TestDataProcessing:
     """Tests for data processing logic."""
@@ -179,6 +370,62 @@ class TestDataProcessing:
         assert metrics.daily_change == 700  # 42500 - 41800
         assert metrics.daily_change_percent > 0
 
+    def test_stored_response_matches_api_response(self, daily_api_response):
+        """Test that a response built from stored rollups equals the API-built one."""
+        from app.models.currency import CurrencyDataProcessor
+
+        # Daily rollups as the database returns them: bucket start, then OHLCV
+        rows = [
+            (datetime.fromisoformat(day).replace(tzinfo=timezone.utc),
+             *(float(value) for value in fields.values()))
+            for day, fields in list(daily_api_response[TIME_SERIES_KEY].items())[:MONTH_DAYS]
+        ]
+
+        stored = CurrencyDataProcessor.process_stored(daily_api_response["Meta Data"], rows)
+        fetched = CurrencyDataProcessor.process_response(daily_api_response)
+
+        assert stored.model_dump() == fetched.model_dump()
+        assert stored.metadata.market_name == "United States Dollar"
+        assert stored.metrics.latest_price == 67234.56
+
+    def test_process_response_metrics_with_real_keys(self, daily_api_response):
+        """Test weekly and monthly metric values for an API-shaped response."""
+        from app.models.currency import CurrencyDataProcessor
+
+        metrics = CurrencyDataProcessor.process_response(daily_api_response).metrics
+
+        assert metrics.latest_date == "2024-02-20"
+        assert metrics.latest_price == 67234.56
+        assert metrics.daily_change == 10.0
+        # Last 7 days: closes 67234.56 down to 67174.56
+        assert metrics.weekly_avg == 67204.56
+        assert metrics.weekly_high == 67236.56
+        assert metrics.weekly_low == 67171.56
+        # Last 30 days: closes 67234.56 down to 66944.56; older days are ignored
+        assert metrics.monthly_avg == 67089.56
+        assert metrics.monthly_high == 67236.56
+        assert metrics.monthly_low == 66941.56
+
+    @pytest.mark.parametrize("order", ["newest_first", "oldest_first", "shuffled"])
+    def test_parse_time_series_arrays_limit_keeps_most_recent_days(self, daily_api_response, order):
+        """Test that limit keeps the most recent days, newest first, whatever the input order."""
+        import random
+        from app.models.currency import CurrencyDataProcessor
+
+        items = list(daily_api_response[TIME_SERIES_KEY].items())
+        if order == "oldest_first":
+            items.reverse()
+        elif order == "shuffled":
+            random.Random(0).shuffle(items)
+
+        dates, ohlcv = CurrencyDataProcessor.parse_time_series_arrays(dict(items), limit=MONTH_DAYS)
+
+        expected_dates = [(date(2024, 2, 20) - timedelta(days=age)).isoformat() for age in range(MONTH_DAYS)]
+        assert dates.tolist() == expected_dates
+        assert ohlcv.shape == (MONTH_DAYS, 5)
+        assert ohlcv[0].tolist() == [67233.56, 67236.56, 67231.56, 67234.56, 1000.0]
+        assert ohlcv[-1, 3] == pytest.approx(66944.56)
+
     def test_calculate_metrics_raises_error_with_empty_data(self):
         """Test that calculate_metrics raises error with empty time series."""
         from app.models.currency import CurrencyDataProcessor
@@ -187,5 +434,107 @@ class TestDataProcessing:
             CurrencyDataProcessor.calculate_metrics([])
 
 
+class TestStoredCurrencyData:
+    """Tests for building currency data from stored daily rollups."""
+
+    @staticmethod
+    def _load(daily_api_response, latest_day):
+        """Load stored data whose most recent bucket starts on latest_day."""
+        from app.main import _load_stored_currency_data
+
+        currency = type("Currency", (), {})()
+        currency.id = 1
+        currency.api_metadata = orjson.dumps(daily_api_response["Meta Data"]).decode()
+        rows = [
+            (datetime.combine(latest_day - timedelta(days=age), datetime.min.time(), timezone.utc),
+             1.0, 2.0, 0.5, 1.5, 100.0)
+            for age in range(MONTH_DAYS)
+        ]
+        with patch('app.main.CryptoCurrencyRepository.get_by_symbol_and_market', return_value=currency), \
+                patch('app.main.CryptoMetricsRepository.get_latest', return_value=rows):
+            return _load_stored_currency_data(None, "BTC", "USD")
+
+    def test_yesterdays_bucket_is_fresh(self, daily_api_response):
+        """Test that rollups ending with yesterday's bucket are served."""
+        today = datetime.now(timezone.utc).date()
+
+        assert self._load(daily_api_response, today) is not None
+        assert self._load(daily_api_response, today - timedelta(days=1)) is not None
+
+    def test_older_bucket_is_stale(self, daily_api_response):
+        """Test that rollups ending two days ago fall back to the API."""
+        today = datetime.now(timezone.utc).date()
+
+        assert self._load(daily_api_response, today - timedelta(days=2)) is None
+
+
+class TestPriceCopyEncoding:
+    """Tests for the binary COPY stream written by CryptoPriceRepository.bulk_copy."""
+
+    @staticmethod
+    def _read_rows(data, offset, count):
+        """Split `count` rows of a binary COPY stream into their raw fields."""
+        rows = []
+        for _ in range(count):
+            (field_count,) = struct.unpack_from("!h", data, offset)
+            offset += 2
+            fields = []
+            for _ in range(field_count):
+                (length,) = struct.unpack_from("!i", data, offset)
+                offset += 4
+                fields.append(data[offset:offset + length])
+                offset += length
+            rows.append(fields)
+        return rows, offset
+
+    def test_encoded_stream_matches_binary_copy_layout(self):
+        """Test the header, per-field lengths, timestamp epoch and trailer of a COPY stream."""
+        from app.database.repository import _encode_price_copy
+
+        records = [
+            {
+                "currency_id": 3,
+                "timestamp": datetime(2024, 1, 15, tzinfo=timezone.utc),
+                # Not representable as float4; prices must survive unchanged
+                "open": 67234.56,
+                "high": 43000.25,
+                "low": 41500.0,
+                "close": 42500.75,
+                "volume": 1234.5,
+            },
+            {
+                # Naive timestamps are UTC; PostgreSQL's epoch is 2000-01-01
+                "currency_id": 4,
+                "timestamp": datetime(2000, 1, 1, 0, 0, 1),
+                "open": 1.0,
+                "high": 2.0,
+                "low": 0.5,
+                "close": 1.5,
+                "volume": 10.0,
+            },
+        ]
+
+        data = _encode_price_copy(records).getvalue()
+
+        # Signature, then zero flags and header-extension length
+        assert data[:11] == b"PGCOPY\n\xff\r\n\x00"
+        assert struct.unpack_from("!ii", data, 11) == (0, 0)
+
+        rows, offset = self._read_rows(data, 19, len(records))
+        assert data[offset:] == struct.pack("!h", -1)
+
+        for fields in rows:
+            assert [len(field) for field in fields] == [4, 8, 8, 8, 8, 8, 8]
+
+        first, second = rows
+        assert struct.unpack("!i", first[0]) == (3,)
+        assert struct.unpack("!q", first[1]) == (8780 * 86400 * 1_000_000,)
+        assert [struct.unpack("!d", field)[0] for field in first[2:6]] == [67234.56, 43000.25, 41500.0, 42500.75]
+        assert struct.unpack("!d", first[6]) == (1234.5,)
+
+        assert struct.unpack("!i", second[0]) == (4,)
+        assert struct.unpack("!q", second[1]) == (1_000_000,)
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])